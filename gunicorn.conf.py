@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gunicorn configuration for CAD-COIN Blockchain
+"""
+
+import os
+import multiprocessing
+
+from src.config import Config
+
+bind = f"{Config.HOST}:{Config.PORT}"
+worker_class = "gevent"
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# Every worker owns a password-hashing pool; unless sized explicitly, split the
+# CPUs between them rather than giving each worker a pool as large as the host.
+# Workers are forked from this process and inherit the adjusted Config.
+if "HASH_POOL_WORKERS" not in os.environ:
+    Config.HASH_POOL_WORKERS = max(1, multiprocessing.cpu_count() // workers)
+
+# Each worker builds its own app: the PostgreSQL pool, Redis clients and the
+# password-hashing process pool must not be shared across fork()
+preload_app = False
+
+
+def on_starting(server):
+    """Apply the schema once, in the master, before any worker is forked"""
+    from src.database import apply_schema
+
+    apply_schema(Config.DATABASE_URL)
@@ -16,8 +16,11 @@ This ultra robust version includes:
 - Mining timeout protection
 """
 
+import atexit
 import logging
-from flask import Flask, jsonify
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -26,6 +29,8 @@ from src.config import Config
 from src.database import DatabaseManager
 from src.cache import CacheManager
 from src.models import UltraRobustBlockchain
+from src.utils import dumps
+from src.api.json_provider import ORJSONProvider
 from src.api.auth import init_auth_routes
 from src.api.blockchain_routes import init_blockchain_routes
 from src.api.stablecoin_routes import init_stablecoin_routes
@@ -41,33 +46,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Invariant error bodies, serialized once
+NOT_FOUND_BODY = dumps({"error": "Endpoint not found"})
+INTERNAL_ERROR_BODY = dumps({"error": "Internal server error"})
 
-def create_app():
-    """Application factory"""
+
+def create_app(init_schema=True):
+    """Application factory; init_schema=False when the schema was applied before startup"""
     app = Flask(__name__)
-    CORS(app)
+    app.json = ORJSONProvider(app)
+    # Only the browser-facing auth and transfer endpoints need CORS headers
+    CORS(app, resources={r"/auth/*": {"origins": "*"}, r"/transaction": {"origins": "*"}})
     
     # Initialize components
-    db_manager = DatabaseManager(Config.DATABASE_URL)
-    cache_manager = CacheManager(Config.REDIS_URL)
+    db_manager = DatabaseManager(Config.DATABASE_URL, Config.DB_POOL_MIN, Config.DB_POOL_MAX,
+                                 activity_flush_interval=Config.ACTIVITY_FLUSH_INTERVAL,
+                                 pool_timeout=Config.DB_POOL_TIMEOUT, init_schema=init_schema)
+    atexit.register(db_manager.close_all)
+    cache_manager = CacheManager(Config.REDIS_URL, Config.CACHE_L1_MAXSIZE, Config.CACHE_L1_TTL,
+                                 Config.REDIS_MAX_CONNECTIONS)
     blockchain = UltraRobustBlockchain(db_manager, cache_manager)
+    # Hashing processes must not be forked from this one: it already runs the cache and
+    # activity threads and holds DB/Redis sockets (and gevent state under gunicorn)
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    app.hash_pool = ProcessPoolExecutor(max_workers=Config.HASH_POOL_WORKERS,
+                                        mp_context=multiprocessing.get_context(start_method))
     
     # Rate limiter
     limiter = Limiter(
         app=app,
         key_func=get_remote_address,
         storage_uri=Config.RATELIMIT_STORAGE_URL,
+        storage_options={"socket_keepalive": True, "max_connections": Config.REDIS_MAX_CONNECTIONS},
         default_limits=["1000 per hour"]
     )
     
     # Register blueprints
-    auth_bp = init_auth_routes(app, db_manager, limiter)
+    auth_bp = init_auth_routes(app, db_manager, cache_manager, limiter, app.hash_pool)
     app.register_blueprint(auth_bp)
     
     blockchain_bp = init_blockchain_routes(app, blockchain, cache_manager, db_manager, limiter)
     app.register_blueprint(blockchain_bp)
     
-    stablecoin_bp = init_stablecoin_routes(app, blockchain, limiter)
+    stablecoin_bp = init_stablecoin_routes(app, blockchain, cache_manager, limiter)
     app.register_blueprint(stablecoin_bp)
     
     # Enhanced Error handlers
@@ -82,11 +103,11 @@ def create_app():
     @app.errorhandler(500)
     def internal_error(error):
         logger.error(f"Internal error: {error}")
-        return jsonify({"error": "Internal server error"}), 500
+        return Response(INTERNAL_ERROR_BODY, status=500, mimetype="application/json")
 
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({"error": "Endpoint not found"}), 404
+        return Response(NOT_FOUND_BODY, status=404, mimetype="application/json")
     
     return app
 
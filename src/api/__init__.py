@@ -2,5 +2,6 @@
 from .auth import auth_bp, token_required
 from .blockchain_routes import blockchain_bp
 from .stablecoin_routes import stablecoin_bp
+from .json_provider import ORJSONProvider
 
-__all__ = ['auth_bp', 'token_required', 'blockchain_bp', 'stablecoin_bp']
\ No newline at end of file
+__all__ = ['auth_bp', 'token_required', 'blockchain_bp', 'stablecoin_bp', 'ORJSONProvider']
\ No newline at end of file
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Request helpers shared by the API blueprints
+"""
+
+from flask import request
+
+from ..utils import loads
+
+
+def parse_body():
+    """Parse the JSON request body once; empty, malformed or non-object bodies yield {}"""
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = loads(raw)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
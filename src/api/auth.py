@@ -5,22 +5,88 @@
 Authentication routes for CAD-COIN Blockchain API
 """
 
+import time
 import logging
+import threading
 import psycopg2
 import bcrypt
 import jwt
-from datetime import datetime
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from cachetools import TTLCache
 from functools import wraps
 from flask import Blueprint, request, jsonify
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 from ..config import Config
+from ._util import parse_body
 
 logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
+password_hasher = PasswordHasher(
+    time_cost=Config.ARGON2_TIME_COST,
+    memory_cost=Config.ARGON2_MEMORY_COST,
+    parallelism=Config.ARGON2_PARALLELISM
+)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with Argon2id"""
+    return password_hasher.hash(password)
+
+
+def verify_password(stored_hash: str, password: str):
+    """Verify a password against an Argon2id or legacy bcrypt hash.
+
+    Returns (is_valid, needs_rehash).
+    """
+    if stored_hash.startswith("$2"):
+        # Legacy bcrypt row: always upgrade to Argon2id on successful login
+        is_valid = bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8"))
+        return is_valid, is_valid
+
+    try:
+        password_hasher.verify(stored_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, password_hasher.check_needs_rehash(stored_hash)
+
+
+# Verified against on the unknown-address path so it costs the same as a real check
+DUMMY_PASSWORD_HASH = password_hasher.hash("cad-coin-dummy-password")
+UNKNOWN_USER_TTL = 5  # seconds
+
+JWT_EXPIRES_SECONDS = int(Config.JWT_ACCESS_TOKEN_EXPIRES.total_seconds())
+
+BEARER_PREFIX = "Bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
+
+# Recently decoded tokens: token string -> (address, exp)
+_token_cache = TTLCache(maxsize=4096, ttl=60)
+_token_cache_lock = threading.Lock()
+
+
+def decode_token(token: str) -> str:
+    """Decode a JWT to its address, reusing successful decodes for up to 60s"""
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        address, exp = cached
+        if time.time() < exp:
+            return address
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"], options={"verify_aud": False})
+    address = data["address"]
+    with _token_cache_lock:
+        _token_cache[token] = (address, data.get("exp", float("inf")))
+    return address
+
 
 def token_required(f):
     @wraps(f)
@@ -30,10 +96,9 @@ def token_required(f):
             return jsonify({"error": "Missing token"}), 401
 
         try:
-            if token.startswith("Bearer "):
-                token = token[7:]
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-            current_user = data["address"]
+            if token[:BEARER_PREFIX_LEN] == BEARER_PREFIX:
+                token = token[BEARER_PREFIX_LEN:]
+            current_user = decode_token(token)
         except jwt.ExpiredSignatureError:
             return jsonify({"error": "Token expired"}), 401
         except jwt.InvalidTokenError:
@@ -43,18 +108,24 @@ def token_required(f):
     return decorated
 
 
-def init_auth_routes(app, db_manager, limiter):
+def init_auth_routes(app, db_manager, cache_manager, limiter, hash_pool=None):
     """Initialize authentication routes"""
+
+    def run_hash(fn, *args):
+        # Keep CPU-bound password hashing off the request thread when a pool is available
+        if hash_pool is None:
+            return fn(*args)
+        return hash_pool.submit(fn, *args).result()
     
     @auth_bp.route("/register", methods=["POST"])
     @limiter.limit("5 per minute")
     def register():
-        data = request.get_json() or {}
+        data = parse_body()
         if not data.get("address") or not data.get("password"):
             return jsonify({"error": "address and password required"}), 400
 
         try:
-            password_hash = bcrypt.hashpw(data["password"].encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+            password_hash = run_hash(hash_password, data["password"])
             with db_manager.get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
@@ -62,6 +133,7 @@ def init_auth_routes(app, db_manager, limiter):
                     """, (data["address"], password_hash, 100))
                     conn.commit()
 
+            cache_manager.delete(f"unknown_user_{data['address']}")
             logger.info(f"User created: {data['address']}")
             return jsonify({"message": "User created", "initial_reputation": 100})
         except psycopg2.IntegrityError:
@@ -73,33 +145,54 @@ def init_auth_routes(app, db_manager, limiter):
     @auth_bp.route("/login", methods=["POST"])
     @limiter.limit("10 per minute")
     def login():
-        data = request.get_json() or {}
+        data = parse_body()
         if not data.get("address") or not data.get("password"):
             return jsonify({"error": "address and password required"}), 400
 
+        unknown_key = f"unknown_user_{data['address']}"
         try:
+            # Recently seen unknown address: skip the database, keep the hash cost
+            if cache_manager.get(unknown_key):
+                run_hash(verify_password, DUMMY_PASSWORD_HASH, data["password"])
+                return jsonify({"error": "Invalid credentials"}), 401
+
             with db_manager.get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT password_hash, reputation_score FROM users WHERE address = %s", (data["address"],))
                     user = cur.fetchone()
-                    if user and bcrypt.checkpw(data["password"].encode("utf-8"), user["password_hash"].encode("utf-8")):
-                        # Update last activity
-                        cur.execute("UPDATE users SET last_activity = CURRENT_TIMESTAMP WHERE address = %s", (data["address"],))
+
+            if not user:
+                run_hash(verify_password, DUMMY_PASSWORD_HASH, data["password"])
+                cache_manager.set(unknown_key, True, UNKNOWN_USER_TTL)
+                return jsonify({"error": "Invalid credentials"}), 401
+
+            is_valid, needs_rehash = run_hash(verify_password, user["password_hash"], data["password"])
+            if not is_valid:
+                return jsonify({"error": "Invalid credentials"}), 401
+
+            if needs_rehash:
+                # Transparently upgrade legacy bcrypt / outdated Argon2 parameters
+                new_hash = run_hash(hash_password, data["password"])
+                with db_manager.get_connection() as conn:
+                    with conn.cursor() as cur:
+                        cur.execute("UPDATE users SET password_hash = %s WHERE address = %s",
+                                    (new_hash, data["address"]))
                         conn.commit()
-                        
-                        token = jwt.encode(
-                            {"address": data["address"], "exp": datetime.utcnow() + Config.JWT_ACCESS_TOKEN_EXPIRES},
-                            Config.JWT_SECRET_KEY,
-                            algorithm="HS256"
-                        )
-                        logger.info(f"Login: {data['address']}")
-                        return jsonify({
-                            "token": token, 
-                            "address": data["address"],
-                            "reputation_score": user["reputation_score"]
-                        })
-                    else:
-                        return jsonify({"error": "Invalid credentials"}), 401
+
+            # Update last activity (buffered, flushed in batches)
+            db_manager.touch_user(data["address"])
+
+            token = jwt.encode(
+                {"address": data["address"], "exp": int(time.time()) + JWT_EXPIRES_SECONDS},
+                Config.JWT_SECRET_KEY,
+                algorithm="HS256"
+            )
+            logger.info(f"Login: {data['address']}")
+            return jsonify({
+                "token": token, 
+                "address": data["address"],
+                "reputation_score": user["reputation_score"]
+            })
         except Exception as e:
             logger.error(f"Login error: {e}")
             return jsonify({"error": "Server error"}), 500
@@ -7,77 +7,107 @@ Blockchain routes for CAD-COIN Blockchain API
 
 import time
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from .auth import token_required
+from ._util import parse_body
+from .json_provider import dumps as dumps_response
+from ..models import CoinSymbol
+from ..utils import dumps
 
 logger = logging.getLogger(__name__)
 
 blockchain_bp = Blueprint('blockchain', __name__)
 
+# Invariant server description, serialized once at import
+_HOME_BODY = dumps({
+    "message": "CAD-COIN Ultra Robust Blockchain Server",
+    "version": "3.0-UltraRobust",
+    "status": "active",
+    "features": [
+        "Adaptive difficulty adjustment",
+        "Progressive reward halving",
+        "Enhanced validation system",
+        "Chain integrity verification",
+        "Transaction fee system",
+        "Priority-based mining",
+        "Timeout protection",
+        "Advanced caching"
+    ],
+    "endpoints": {
+        "auth": {
+            "/auth/register": "POST",
+            "/auth/login": "POST"
+        },
+        "blockchain": {
+            "/chain": "GET (paginated, ?after_index= for keyset streaming)",
+            "/info": "GET (enhanced)",
+            "/balance/<address>": "GET",
+            "/balance/<address>/<coin_type>": "GET",
+            "/mine": "POST (auth, ultra robust)",
+            "/transaction": "POST (auth, with fees)"
+        },
+        "stablecoins": {
+            "/stable_coin": "POST (auth)",
+            "/mint": "POST (auth, enhanced)",
+            "/authorize_minter": "POST (auth)",
+            "/stable_coins": "GET"
+        },
+        "ops": {
+            "/pending_transactions": "GET",
+            "/health": "GET",
+            "/validate_chain": "GET (new)",
+            "/mining_stats": "GET (new)"
+        }
+    }
+})
+
 
 def init_blockchain_routes(app, blockchain, cache_manager, db_manager, limiter):
     """Initialize blockchain routes"""
     
     @blockchain_bp.route("/", methods=["GET"])
     def home():
-        return jsonify({
-            "message": "CAD-COIN Ultra Robust Blockchain Server",
-            "version": "3.0-UltraRobust",
-            "status": "active",
-            "features": [
-                "Adaptive difficulty adjustment",
-                "Progressive reward halving",
-                "Enhanced validation system",
-                "Chain integrity verification",
-                "Transaction fee system",
-                "Priority-based mining",
-                "Timeout protection",
-                "Advanced caching"
-            ],
-            "endpoints": {
-                "auth": {
-                    "/auth/register": "POST",
-                    "/auth/login": "POST"
-                },
-                "blockchain": {
-                    "/chain": "GET (paginated)",
-                    "/info": "GET (enhanced)",
-                    "/balance/<address>": "GET",
-                    "/balance/<address>/<coin_type>": "GET",
-                    "/mine": "POST (auth, ultra robust)",
-                    "/transaction": "POST (auth, with fees)"
-                },
-                "stablecoins": {
-                    "/stable_coin": "POST (auth)",
-                    "/mint": "POST (auth, enhanced)",
-                    "/authorize_minter": "POST (auth)",
-                    "/stable_coins": "GET"
-                },
-                "ops": {
-                    "/pending_transactions": "GET",
-                    "/health": "GET",
-                    "/validate_chain": "GET (new)",
-                    "/mining_stats": "GET (new)"
-                }
-            }
-        })
+        return Response(_HOME_BODY, mimetype="application/json")
 
     @blockchain_bp.route("/info", methods=["GET"])
     def get_info():
-        return jsonify(blockchain.get_enhanced_chain_info())
+        return Response(blockchain.get_enhanced_chain_info_json(), mimetype="application/json")
 
     @blockchain_bp.route("/chain", methods=["GET"])
     def get_chain():
         try:
             limit = int(request.args.get("limit", "20"))
             offset = int(request.args.get("offset", "0"))
+            after_index = request.args.get("after_index")
+            after_index = int(after_index) if after_index is not None else None
         except ValueError:
-            return jsonify({"error": "limit/offset must be integers"}), 400
+            return jsonify({"error": "limit/offset/after_index must be integers"}), 400
 
         limit = max(1, min(limit, 200))
+        if after_index is not None:
+            def generate():
+                # Keyset page streamed row by row: {"blocks":[...],"limit":..,"next_after_index":..}
+                yield b'{"blocks":['
+                last_index = None
+                for block in blockchain.get_blocks_keyset(after_index, limit):
+                    if last_index is not None:
+                        yield b","
+                    # Same datetime format as the jsonify() offset pages
+                    yield dumps_response(block)
+                    last_index = block["index"]
+                yield b'],"limit":%d,"after_index":%d,"next_after_index":%s}' % (
+                    limit, after_index, dumps(last_index))
+
+            return Response(stream_with_context(generate()), mimetype="application/json")
+
         offset = max(0, offset)
         blocks = blockchain.get_blocks(limit=limit, offset=offset)
-        return jsonify({"blocks": blocks, "limit": limit, "offset": offset})
+        return jsonify({
+            "blocks": blocks,
+            "limit": limit,
+            "offset": offset,
+            "next_after_index": blocks[-1]["index"] if blocks else None
+        })
 
     @blockchain_bp.route("/balance/<address>", methods=["GET"])
     def get_balance_all(address):
@@ -91,23 +121,24 @@ def init_blockchain_routes(app, blockchain, cache_manager, db_manager, limiter):
 
     @blockchain_bp.route("/balance/<address>/<coin_type>", methods=["GET"])
     def get_balance_coin(address, coin_type):
-        balance = blockchain.get_balance(address, coin_type.upper())
+        coin_type = CoinSymbol(coin_type)
+        balance = blockchain.get_balance(address, coin_type)
         return jsonify({
             "address": address, 
-            "coin_type": coin_type.upper(), 
-            "balance": balance,
-            "formatted_balance": f"{balance:.8f}"
+            "coin_type": coin_type, 
+            "balance": float(balance),
+            "formatted_balance": format(balance, ".8f")
         })
 
     @blockchain_bp.route("/transaction", methods=["POST"])
     @token_required
     @limiter.limit("100 per hour")
     def create_transaction(current_user):
-        data = request.get_json() or {}
+        data = parse_body()
         if "receiver" not in data or "amount" not in data:
             return jsonify({"error": "Missing fields: receiver, amount"}), 400
 
-        coin_type = (data.get("coin_type") or "CAD-COIN").upper()
+        coin_type = CoinSymbol(data.get("coin_type") or "CAD-COIN")
         fee = data.get("fee")  # Optional custom fee
         
         success, message = blockchain.create_transaction(
@@ -128,8 +159,7 @@ def init_blockchain_routes(app, blockchain, cache_manager, db_manager, limiter):
     def mine_block(current_user):
         success, message = blockchain.mine_pending_transactions(current_user)
         if success:
-            # Invalidate balance cache for miner
-            cache_manager.delete(f"balance_{current_user}_*")
+            # Miner balance caches were already invalidated with the block commit
             return jsonify({"message": message, "miner": current_user})
         else:
             return jsonify({"error": message}), 400
@@ -162,34 +192,35 @@ def init_blockchain_routes(app, blockchain, cache_manager, db_manager, limiter):
         """Get detailed mining statistics"""
         with db_manager.get_connection() as conn:
             with conn.cursor() as cur:
-                # Recent mining attempts
+                # Top miners (last 24 hours) and network statistics (last 100 blocks),
+                # built server-side as one JSON document in a single round-trip
                 cur.execute("""
-                    SELECT miner, COUNT(*) as attempts, 
-                           SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful,
-                           AVG(CASE WHEN success THEN (end_time - start_time) ELSE NULL END) as avg_time
-                    FROM mining_attempts 
-                    WHERE start_time > %s
-                    GROUP BY miner
-                    ORDER BY successful DESC
-                    LIMIT 10
-                """, (time.time() - 86400,))  # Last 24 hours
-                
-                miners = [dict(row) for row in cur.fetchall()]
-                
-                # Network statistics
-                cur.execute("""
-                    SELECT AVG(difficulty) as avg_difficulty,
-                           AVG(current_reward) as avg_reward,
-                           AVG(hash_rate) as avg_hash_rate
-                    FROM chain_stats
-                    WHERE block_index >= %s
-                """, (max(0, blockchain.get_enhanced_chain_info()["chain_length"] - 100),))
-                
-                network_stats = cur.fetchone()
+                    WITH recent_miners AS (
+                        SELECT miner, COUNT(*) as attempts, 
+                               SUM(success::int) as successful,
+                               AVG(CASE WHEN success THEN (end_time - start_time) END) as avg_time
+                        FROM mining_attempts 
+                        WHERE start_time > %s
+                        GROUP BY miner
+                        ORDER BY successful DESC
+                        LIMIT 10
+                    ), network AS (
+                        SELECT AVG(current_difficulty) as avg_difficulty,
+                               AVG(current_reward) as avg_reward,
+                               AVG(hash_rate) as avg_hash_rate
+                        FROM chain_stats
+                        WHERE block_index >= (SELECT GREATEST(0, COALESCE(MAX(index), 0) - 99) FROM blocks)
+                    )
+                    SELECT json_build_object(
+                        'miners', COALESCE((SELECT json_agg(recent_miners ORDER BY successful DESC) FROM recent_miners), '[]'::json),
+                        'network', (SELECT row_to_json(network) FROM network)
+                    ) AS stats
+                """, (time.time() - 86400,))
+                stats = cur.fetchone()["stats"]
                 
         return jsonify({
-            "top_miners_24h": miners,
-            "network_stats": dict(network_stats) if network_stats else {},
+            "top_miners_24h": stats["miners"],
+            "network_stats": stats["network"] or {},
             "current_difficulty": blockchain.calculate_current_difficulty(),
             "next_reward": blockchain.calculate_mining_reward(blockchain.get_latest_block()["index"] + 1),
             "target_block_time": blockchain.target_block_time,
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+orjson-backed Flask JSON provider for CAD-COIN Blockchain API
+"""
+
+from datetime import date
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+from ..utils import loads
+
+
+def _default(value):
+    # Same as Flask's default provider: dates as HTTP dates, other unknown types as str
+    if isinstance(value, date):
+        return http_date(value)
+    return str(value)
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default,
+                        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class ORJSONProvider(JSONProvider):
+    """Route jsonify() and request JSON parsing through orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype="application/json")
@@ -6,29 +6,32 @@ Stablecoin routes for CAD-COIN Blockchain API
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from .auth import token_required
+from ._util import parse_body
+from ..models import CoinSymbol, to_amount
+from ..utils import dumps
 
 logger = logging.getLogger(__name__)
 
 stablecoin_bp = Blueprint('stablecoin', __name__)
 
 
-def init_stablecoin_routes(app, blockchain, limiter):
+def init_stablecoin_routes(app, blockchain, cache_manager, limiter):
     """Initialize stablecoin routes"""
     
     @stablecoin_bp.route("/stable_coin", methods=["POST"])
     @token_required
     @limiter.limit("5 per hour")
     def create_stable_coin(current_user):
-        data = request.get_json() or {}
+        data = parse_body()
         required = ["name", "symbol", "backed_by"]
         if not all(k in data for k in required):
             return jsonify({"error": "Missing: name, symbol, backed_by"}), 400
 
         success, message = blockchain.create_stable_coin(
             data["name"],
-            data["symbol"],
+            CoinSymbol(data["symbol"]),
             float(data.get("collateral_ratio", 1.0)),
             data["backed_by"],
             float(data["max_supply"]) if data.get("max_supply") is not None else None
@@ -42,16 +45,39 @@ def init_stablecoin_routes(app, blockchain, limiter):
     @token_required
     @limiter.limit("20 per hour")
     def mint_stable(current_user):
-        data = request.get_json() or {}
+        data = parse_body()
         required = ["coin_symbol", "recipient", "amount"]
         if not all(k in data for k in required):
             return jsonify({"error": "Missing: coin_symbol, recipient, amount"}), 400
 
         success, message = blockchain.mint_stable_coin(
-            data["coin_symbol"],
+            CoinSymbol(data["coin_symbol"]),
             current_user,
             data["recipient"],
-            float(data["amount"])
+            data["amount"]
+        )
+        if success:
+            return jsonify({"message": message})
+        else:
+            return jsonify({"error": message}), 400
+
+    @stablecoin_bp.route("/mint_bulk", methods=["POST"])
+    @token_required
+    @limiter.limit("20 per hour")
+    def mint_stable_bulk(current_user):
+        data = parse_body()
+        mints = data.get("mints")
+        if "coin_symbol" not in data or not isinstance(mints, list) or not mints:
+            return jsonify({"error": "Missing: coin_symbol, mints"}), 400
+        try:
+            mints = [(m["recipient"], to_amount(m["amount"])) for m in mints]
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": "Each mint needs recipient and amount"}), 400
+
+        success, message = blockchain.mint_stable_coin_bulk(
+            CoinSymbol(data["coin_symbol"]),
+            current_user,
+            mints
         )
         if success:
             return jsonify({"message": message})
@@ -62,13 +88,13 @@ def init_stablecoin_routes(app, blockchain, limiter):
     @token_required
     @limiter.limit("10 per hour")
     def authorize_minter(current_user):
-        data = request.get_json() or {}
+        data = parse_body()
         required = ["coin_symbol", "minter_address"]
         if not all(k in data for k in required):
             return jsonify({"error": "Missing: coin_symbol, minter_address"}), 400
 
         success, message = blockchain.add_authorized_minter(
-            data["coin_symbol"],
+            CoinSymbol(data["coin_symbol"]),
             data["minter_address"],
             current_user  # Use current user as authorizer
         )
@@ -79,7 +105,11 @@ def init_stablecoin_routes(app, blockchain, limiter):
 
     @stablecoin_bp.route("/stable_coins", methods=["GET"])
     def list_stable_coins():
-        sc = blockchain.get_stable_coins()
-        return jsonify({"stable_coins": sc, "count": len(sc)})
+        raw = cache_manager.get_raw("stable_coins_response")
+        if raw is None:
+            sc = blockchain.get_stable_coins()
+            raw = dumps({"stable_coins": sc, "count": len(sc)})
+            cache_manager.set_raw("stable_coins_response", raw)
+        return Response(raw, mimetype="application/json")
 
     return stablecoin_bp
\ No newline at end of file
@@ -5,47 +5,186 @@
 Enhanced Cache Manager for CAD-COIN Blockchain
 """
 
-import json
+import time
+import fnmatch
 import logging
+import threading
 import redis
+from cachetools import TTLCache
+
+from ..utils import dumps, loads
 
 logger = logging.getLogger(__name__)
 
+INVALIDATION_CHANNEL = "cache:inval"
+
 
 class CacheManager:
-    def __init__(self, redis_url: str):
-        self.redis_client = redis.from_url(redis_url)
+    def __init__(self, redis_url: str, l1_maxsize: int = 2048, l1_ttl: float = 2,
+                 max_connections: int = 64):
+        self.redis_client = redis.from_url(redis_url, max_connections=max_connections, socket_keepalive=True)
         self.cache_ttl = 3600  # 1 hour default
 
+        # Per-process L1 in front of Redis; holds raw Redis payloads for a short TTL
+        self._l1 = TTLCache(maxsize=l1_maxsize, ttl=l1_ttl)
+        self._l1_lock = threading.Lock()
+        self._invalidation_callbacks = []
+        listener = threading.Thread(target=self._listen_for_invalidations, name="cache-invalidation", daemon=True)
+        listener.start()
+
+    def _l1_get(self, key):
+        with self._l1_lock:
+            return self._l1.get(key)
+
+    def _l1_put(self, key, raw):
+        with self._l1_lock:
+            self._l1[key] = raw
+
+    def _l1_evict(self, *keys):
+        """Drop L1 entries for exact keys or glob patterns"""
+        with self._l1_lock:
+            for key in keys:
+                if any(ch in key for ch in "*?["):
+                    for cached_key in [k for k in self._l1 if fnmatch.fnmatchcase(k, key)]:
+                        self._l1.pop(cached_key, None)
+                else:
+                    self._l1.pop(key, None)
+
+    def _listen_for_invalidations(self):
+        """Evict L1 entries invalidated by any worker sharing this Redis"""
+        while True:
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    key = message["data"].decode("utf-8")
+                    self._l1_evict(key)
+                    self._notify_invalidation(key)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                # Invalidations may have been missed while disconnected
+                with self._l1_lock:
+                    self._l1.clear()
+                self._notify_invalidation("*")
+                time.sleep(1)
+
+    def add_invalidation_callback(self, callback):
+        """Call callback(key_or_pattern) for every invalidation published by any worker"""
+        self._invalidation_callbacks.append(callback)
+
+    def _notify_invalidation(self, key):
+        for callback in self._invalidation_callbacks:
+            try:
+                callback(key)
+            except Exception as e:
+                logger.error(f"Cache invalidation callback error: {e}")
+
     def get(self, key):
+        value = self.get_raw(key)
         try:
-            value = self.redis_client.get(key)
-            return json.loads(value) if value else None
+            return loads(value) if value else None
+        except Exception as e:
+            logger.error(f"Cache get error: {e}")
+            return None
+
+    def get_raw(self, key):
+        """Return the stored JSON bytes for key without decoding them"""
+        try:
+            value = self._l1_get(key)
+            if value is None:
+                value = self.redis_client.get(key)
+                if value:
+                    self._l1_put(key, value)
+            return value or None
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             return None
 
     def set(self, key, value, ttl=None):
+        self.set_raw(key, dumps(value), ttl)
+
+    def set_raw(self, key, raw, ttl=None):
+        """Store already-serialized JSON bytes under key"""
         try:
-            self.redis_client.setex(
-                key,
-                ttl or self.cache_ttl,
-                json.dumps(value, default=str)
-            )
+            self._l1_evict(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, ttl or self.cache_ttl, raw)
+            pipe.publish(INVALIDATION_CHANNEL, key)
+            pipe.execute()
         except Exception as e:
             logger.error(f"Cache set error: {e}")
 
-    def delete(self, key):
+    def mget(self, keys):
+        """Fetch several keys in a single round-trip"""
+        if not keys:
+            return []
+        try:
+            values = [self._l1_get(key) for key in keys]
+            missing = [i for i, value in enumerate(values) if value is None]
+            if missing:
+                fetched = self.redis_client.mget([keys[i] for i in missing])
+                for i, value in zip(missing, fetched):
+                    if value:
+                        values[i] = value
+                        self._l1_put(keys[i], value)
+            return [loads(value) if value else None for value in values]
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}")
+            return [None] * len(keys)
+
+    def mset(self, mapping, ttl=None):
+        """Store several keys with a TTL in a single pipelined round-trip"""
+        if not mapping:
+            return
         try:
-            self.redis_client.delete(key)
+            self._l1_evict(*mapping)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.setex(key, ttl or self.cache_ttl, dumps(value))
+                pipe.publish(INVALIDATION_CHANNEL, key)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache mset error: {e}")
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        try:
+            self._l1_evict(*keys)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(*keys)
+            for key in keys:
+                pipe.publish(INVALIDATION_CHANNEL, key)
+            pipe.execute()
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
 
-    def invalidate_pattern(self, pattern):
+    def invalidate_pattern(self, pattern, batch_size=500):
         """Invalidate all cache keys matching pattern"""
+        self.invalidate_patterns([pattern], batch_size=batch_size)
+
+    def invalidate_patterns(self, patterns, keys=(), batch_size=500):
+        """Invalidate every key matching any of patterns, plus the exact keys, in one pipeline.
+
+        Uses incremental SCAN instead of KEYS so Redis is never blocked on a
+        full keyspace walk; deletes and invalidation messages are queued on a
+        single pipeline and flushed in batches, so a mixed invalidation costs
+        the SCAN pages plus one final round trip.
+        """
         try:
-            keys = self.redis_client.keys(pattern)
+            self._l1_evict(*patterns, *keys)
+            pipe = self.redis_client.pipeline(transaction=False)
             if keys:
-                self.redis_client.delete(*keys)
+                pipe.delete(*keys)
+            count = 0
+            for pattern in patterns:
+                for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+                    pipe.delete(key)
+                    count += 1
+                    if count % batch_size == 0:
+                        pipe.execute()
+            for key in (*patterns, *keys):
+                pipe.publish(INVALIDATION_CHANNEL, key)
+            pipe.execute()
         except Exception as e:
-            logger.error(f"Cache pattern invalidation error: {e}")
\ No newline at end of file
+            logger.error(f"Cache pattern invalidation error: {e}")
@@ -1,4 +1,4 @@
 # Database module
-from .manager import DatabaseManager
+from .manager import DatabaseManager, apply_schema
 
-__all__ = ['DatabaseManager']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'apply_schema']
\ No newline at end of file
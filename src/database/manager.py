@@ -5,187 +5,510 @@
 Enhanced Database Manager for CAD-COIN Blockchain
 """
 
+import io
+import csv
 import time
 import logging
+import threading
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
+from psycopg2.extras import execute_values
+
+from ..utils import loads
 
 logger = logging.getLogger(__name__)
 
+# Decode JSON/JSONB result columns (transaction metadata) with orjson
+psycopg2.extras.register_default_json(globally=True, loads=loads)
+psycopg2.extras.register_default_jsonb(globally=True, loads=loads)
+
+# Full schema, applied in a single round-trip; every statement is idempotent
+SCHEMA_SQL = """
+-- Users with enhanced features
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    address VARCHAR(255) UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    is_authorized_minter BOOLEAN DEFAULT FALSE,
+    reputation_score INTEGER DEFAULT 100,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Enhanced Blocks table
+CREATE TABLE IF NOT EXISTS blocks (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    index INTEGER UNIQUE NOT NULL,
+    hash VARCHAR(64) UNIQUE NOT NULL,
+    previous_hash VARCHAR(64) NOT NULL,
+    miner VARCHAR(255) NOT NULL,
+    nonce BIGINT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    timestamp DOUBLE PRECISION NOT NULL,
+    mining_time DOUBLE PRECISION DEFAULT 0,
+    block_size INTEGER DEFAULT 0,
+    total_fees DECIMAL(20, 8) DEFAULT 0,
+    validation_status VARCHAR(20) DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Enhanced Transactions table
+CREATE TABLE IF NOT EXISTS transactions (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    tx_id VARCHAR(36) UNIQUE NOT NULL,
+    block_index INTEGER REFERENCES blocks(index),
+    sender VARCHAR(255) NOT NULL,
+    receiver VARCHAR(255) NOT NULL,
+    amount DECIMAL(20, 8) NOT NULL,
+    fee DECIMAL(20, 8) DEFAULT 0,
+    coin_type VARCHAR(50) NOT NULL,
+    transaction_type VARCHAR(50) NOT NULL,
+    metadata JSONB,
+    timestamp DOUBLE PRECISION NOT NULL,
+    validation_status VARCHAR(20) DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Stable coins (unchanged)
+CREATE TABLE IF NOT EXISTS stable_coins (
+    id SERIAL PRIMARY KEY,
+    symbol VARCHAR(20) UNIQUE NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    collateral_ratio DECIMAL(10, 4) NOT NULL,
+    backed_by VARCHAR(50) NOT NULL,
+    max_supply DECIMAL(20, 8),
+    total_supply DECIMAL(20, 8) DEFAULT 0,
+    creation_date DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Enhanced Balances table
+CREATE TABLE IF NOT EXISTS balances (
+    id SERIAL PRIMARY KEY,
+    address VARCHAR(255) NOT NULL,
+    coin_type VARCHAR(50) NOT NULL,
+    balance DECIMAL(20, 8) DEFAULT 0,
+    frozen_balance DECIMAL(20, 8) DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(address, coin_type)
+);
+
+-- Authorized minters (unchanged)
+CREATE TABLE IF NOT EXISTS authorized_minters (
+    id SERIAL PRIMARY KEY,
+    coin_symbol VARCHAR(20) NOT NULL REFERENCES stable_coins(symbol),
+    minter_address VARCHAR(255) NOT NULL,
+    authorizer VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(coin_symbol, minter_address)
+);
+
+-- Enhanced Pending transactions table
+CREATE TABLE IF NOT EXISTS pending_transactions (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    tx_id VARCHAR(36) UNIQUE NOT NULL,
+    sender VARCHAR(255) NOT NULL,
+    receiver VARCHAR(255) NOT NULL,
+    amount DECIMAL(20, 8) NOT NULL,
+    fee DECIMAL(20, 8) DEFAULT 0,
+    coin_type VARCHAR(50) NOT NULL,
+    transaction_type VARCHAR(50) NOT NULL,
+    metadata JSONB,
+    timestamp DOUBLE PRECISION NOT NULL,
+    priority_score BIGINT DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- Age-weighted priority, fixed at insert time (see models.blockchain.priority_score).
+-- One-time migration: ALTER TYPE takes an ACCESS EXCLUSIVE lock and the re-score
+-- rewrites the pool, so both run only while the column is missing or not yet BIGINT
+DO $$
+DECLARE
+    score_type TEXT;
+BEGIN
+    SELECT data_type INTO score_type FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'pending_transactions'
+      AND column_name = 'priority_score';
+    IF score_type IS NULL OR score_type <> 'bigint' THEN
+        IF score_type IS NULL THEN
+            ALTER TABLE pending_transactions ADD COLUMN priority_score BIGINT DEFAULT 0;
+        ELSE
+            ALTER TABLE pending_transactions ALTER COLUMN priority_score TYPE BIGINT;
+        END IF;
+        UPDATE pending_transactions SET priority_score = ROUND((fee - timestamp / 3600) * 1000000);
+    END IF;
+END $$;
+
+-- Chain statistics table
+CREATE TABLE IF NOT EXISTS chain_stats (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    block_index INTEGER UNIQUE NOT NULL,
+    current_difficulty INTEGER NOT NULL,
+    current_reward DECIMAL(20, 8) NOT NULL,
+    avg_block_time DOUBLE PRECISION DEFAULT 0,
+    hash_rate DOUBLE PRECISION DEFAULT 0,
+    difficulty_fp BIGINT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- Exact ASERT difficulty the block was mined at, in 1/65536 digits; NULL on older rows
+ALTER TABLE chain_stats ADD COLUMN IF NOT EXISTS difficulty_fp BIGINT;
+
+-- Mining attempts table for difficulty calculation. Purely statistical and cheap
+-- to lose, so it skips WAL; a crash truncates it.
+CREATE UNLOGGED TABLE IF NOT EXISTS mining_attempts (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    block_index INTEGER NOT NULL,
+    miner VARCHAR(255) NOT NULL,
+    start_time DOUBLE PRECISION NOT NULL,
+    end_time DOUBLE PRECISION,
+    success BOOLEAN DEFAULT FALSE,
+    attempts_count BIGINT DEFAULT 0
+);
+-- Tables created before it was unlogged are converted once; SET UNLOGGED rewrites the table
+DO $$
+BEGIN
+    IF (SELECT relpersistence FROM pg_class WHERE oid = 'mining_attempts'::regclass) = 'p' THEN
+        ALTER TABLE mining_attempts SET UNLOGGED;
+    END IF;
+END $$;
+
+-- Ensure reputation_score and last_activity columns exist in users table
+ALTER TABLE users ADD COLUMN IF NOT EXISTS reputation_score INTEGER DEFAULT 100;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+-- Ensure fee column exists in pending_transactions table
+ALTER TABLE pending_transactions ADD COLUMN IF NOT EXISTS fee DECIMAL(20, 8) DEFAULT 0;
+
+-- Enhanced Indexes
+CREATE INDEX IF NOT EXISTS idx_blocks_hash ON blocks(hash);
+CREATE INDEX IF NOT EXISTS idx_blocks_miner ON blocks(miner);
+CREATE INDEX IF NOT EXISTS idx_blocks_timestamp ON blocks(timestamp);
+CREATE INDEX IF NOT EXISTS idx_transactions_block ON transactions(block_index);
+CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_chain_stats_block ON chain_stats(block_index);
+
+-- Covering indexes for /mining_stats aggregations (index-only scans on PG11+)
+CREATE INDEX IF NOT EXISTS idx_mining_attempts_start_time_miner
+    ON mining_attempts (start_time DESC) INCLUDE (miner, success, end_time);
+CREATE INDEX IF NOT EXISTS idx_chain_stats_block_covering
+    ON chain_stats (block_index DESC) INCLUDE (current_difficulty, current_reward, hash_rate);
+
+-- Balances are updated in place on every transfer: leave page headroom so those
+-- updates stay HOT. No index may cover balance or updated_at, and the
+-- UNIQUE (address, coin_type) index already serves per-address lookups.
+ALTER TABLE balances SET (fillfactor = 80);
+DROP INDEX IF EXISTS idx_balances_address;
+
+-- Mempool selection (top-K by priority, then fee, oldest first) as an index-ordered scan;
+-- supersedes the former single-column priority index
+CREATE INDEX IF NOT EXISTS idx_pending_priority_fee
+    ON pending_transactions (priority_score DESC, fee DESC, timestamp ASC)
+    INCLUDE (tx_id, sender, receiver, amount, coin_type);
+DROP INDEX IF EXISTS idx_pending_priority;
+
+-- The mempool is a queue: every mined block deletes up to max_block_size rows.
+-- Vacuum it after a fixed number of dead rows instead of a fraction of the
+-- table, so dead tuples never pile up in its heap and indexes between mines.
+ALTER TABLE pending_transactions SET (
+    autovacuum_vacuum_scale_factor = 0,
+    autovacuum_vacuum_threshold = 1000,
+    autovacuum_analyze_scale_factor = 0,
+    autovacuum_analyze_threshold = 1000
+);
+
+-- Recent activity per address as index-only scans, already in timestamp order;
+-- these supersede the former single-column sender/receiver indexes
+CREATE INDEX IF NOT EXISTS idx_tx_sender_time
+    ON transactions (sender, timestamp DESC) INCLUDE (amount, fee, coin_type, tx_id, receiver);
+CREATE INDEX IF NOT EXISTS idx_tx_receiver_time
+    ON transactions (receiver, timestamp DESC) INCLUDE (amount, fee, coin_type, tx_id, sender);
+DROP INDEX IF EXISTS idx_transactions_sender;
+DROP INDEX IF EXISTS idx_transactions_receiver;
+
+-- Containment (metadata @> '{...}') lookups on confirmed transactions
+CREATE INDEX IF NOT EXISTS idx_transactions_metadata
+    ON transactions USING GIN (metadata jsonb_path_ops);
+
+-- Row counts of blocks and pending_transactions, kept current by statement-level
+-- triggers so chain info never has to COUNT(*) either table
+CREATE TABLE IF NOT EXISTS meta_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION meta_counters_add() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE meta_counters SET value = value + (SELECT COUNT(*) FROM changed_rows) WHERE name = TG_ARGV[0];
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION meta_counters_sub() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE meta_counters SET value = value - (SELECT COUNT(*) FROM changed_rows) WHERE name = TG_ARGV[0];
+    RETURN NULL;
+END $$;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'blocks_count_insert') THEN
+        CREATE TRIGGER blocks_count_insert AFTER INSERT ON blocks
+            REFERENCING NEW TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION meta_counters_add('blocks');
+        CREATE TRIGGER blocks_count_delete AFTER DELETE ON blocks
+            REFERENCING OLD TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION meta_counters_sub('blocks');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'pending_count_insert') THEN
+        CREATE TRIGGER pending_count_insert AFTER INSERT ON pending_transactions
+            REFERENCING NEW TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION meta_counters_add('pending');
+        CREATE TRIGGER pending_count_delete AFTER DELETE ON pending_transactions
+            REFERENCING OLD TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION meta_counters_sub('pending');
+    END IF;
+END $$;
+
+-- One-time seed; the triggers above already hold their table locks, so no
+-- concurrent write can fall between this count and the first tracked change
+INSERT INTO meta_counters (name, value)
+VALUES ('blocks', (SELECT COUNT(*) FROM blocks)),
+       ('pending', (SELECT COUNT(*) FROM pending_transactions))
+ON CONFLICT (name) DO NOTHING;
+
+-- Initialize CAD-COIN if not present
+INSERT INTO stable_coins (symbol, name, collateral_ratio, backed_by, creation_date)
+VALUES ('CAD-COIN', 'CAD-COIN', 1.0000, 'CAD', %(now)s)
+ON CONFLICT (symbol) DO NOTHING;
+"""
+
+# Column order expected by DatabaseManager.bulk_insert_transactions
+TRANSACTION_COLUMNS = ("tx_id", "block_index", "sender", "receiver", "amount", "fee", "coin_type",
+                       "transaction_type", "metadata", "timestamp", "validation_status")
+COPY_THRESHOLD = 1000  # Rows above which COPY beats multi-row INSERT
+
+# Hot-path statements, prepared lazily once per pooled connection and run with EXECUTE
+PREPARED_STATEMENTS = {
+    # Mempool admission: inserts only if the coin exists and the pool is below $11
+    "admit_pending_tx": """
+        INSERT INTO pending_transactions
+        (tx_id, sender, receiver, amount, fee, coin_type, transaction_type, metadata, timestamp, priority_score)
+        SELECT $1::varchar, $2::varchar, $3::varchar, $4::numeric, $5::numeric, $6::varchar, $7::varchar,
+               $8::jsonb, $9::float8, $10::bigint
+        WHERE EXISTS (SELECT 1 FROM stable_coins WHERE symbol = $6::varchar)
+          AND (SELECT value FROM meta_counters WHERE name = 'pending') < $11::bigint
+    """,
+    "insert_block": """
+        INSERT INTO blocks
+        (index, hash, previous_hash, miner, nonce, difficulty, timestamp,
+         mining_time, block_size, total_fees, validation_status)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, 'validated')
+    """,
+    "insert_chain_stats": """
+        INSERT INTO chain_stats (block_index, current_difficulty, current_reward, avg_block_time, hash_rate,
+                                 difficulty_fp)
+        VALUES ($1, $2, $3, $4, $5, $6)
+    """,
+    "insert_mining_attempt": """
+        INSERT INTO mining_attempts (block_index, miner, start_time, end_time, success, attempts_count)
+        VALUES ($1, $2, $3, $4, $5, $6)
+    """,
+    "stable_coin_supply": """
+        SELECT max_supply, COALESCE(total_supply, 0) AS total_supply FROM stable_coins WHERE symbol = $1::varchar
+    """,
+    "check_minter": """
+        SELECT 1 FROM authorized_minters
+        WHERE coin_symbol = $1::varchar AND minter_address = $2::varchar
+        LIMIT 1
+    """,
+    "authorize_minter": """
+        INSERT INTO authorized_minters (coin_symbol, minter_address, authorizer)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (coin_symbol, minter_address) DO NOTHING
+        RETURNING minter_address
+    """,
+    # Authorization, supply cap, supply increment and the pending mint in one statement;
+    # the cap sits in the UPDATE's WHERE so it is re-checked against concurrent mints,
+    # and the mint is queued only if that UPDATE matched
+    "mint_stable": """
+        WITH auth AS (
+            SELECT $1::varchar = 'system' OR EXISTS (
+                SELECT 1 FROM authorized_minters
+                WHERE coin_symbol = $2::varchar AND minter_address = $1::varchar
+            ) AS ok
+        ), supply AS (
+            UPDATE stable_coins SET total_supply = COALESCE(total_supply, 0) + $3::numeric
+            WHERE symbol = $2::varchar
+              AND (SELECT ok FROM auth)
+              AND (max_supply IS NULL OR COALESCE(total_supply, 0) + $3::numeric <= max_supply)
+            RETURNING symbol, total_supply
+        ), queued AS (
+            INSERT INTO pending_transactions
+            (tx_id, sender, receiver, amount, fee, coin_type, transaction_type, metadata,
+             timestamp, priority_score)
+            SELECT $4::varchar, $5::varchar, $6::varchar, $3::numeric, $7::numeric, symbol,
+                   $8::varchar, $9::jsonb, $10::float8, $11::bigint
+            FROM supply
+            RETURNING tx_id
+        )
+        SELECT EXISTS (SELECT 1 FROM stable_coins WHERE symbol = $2::varchar) AS coin_exists,
+               (SELECT ok FROM auth) AS authorized,
+               EXISTS (SELECT 1 FROM queued) AS minted,
+               (SELECT total_supply FROM supply) AS total_supply
+    """,
+}
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that tracks which PREPARED_STATEMENTS its server session already holds"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+def apply_schema(database_url: str):
+    """Apply SCHEMA_SQL over one short-lived connection, outside any pool.
+
+    Lets a process supervisor (the gunicorn master) migrate once before it
+    forks workers, instead of every worker racing through the DDL.
+    """
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(SCHEMA_SQL, {"now": time.time()})
+        logger.info("Enhanced database initialized successfully")
+    finally:
+        conn.close()
+
 
 class DatabaseManager:
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, minconn: int = 4, maxconn: int = 32,
+                 activity_flush_interval: float = 60, pool_timeout: float = 10,
+                 init_schema: bool = True):
         self.database_url = database_url
-        self.init_database()
+        self._pool = psycopg2.pool.ThreadedConnectionPool(
+            minconn, maxconn, database_url,
+            connection_factory=PreparingConnection,
+            cursor_factory=psycopg2.extras.RealDictCursor
+        )
+        # ThreadedConnectionPool raises as soon as maxconn connections are out;
+        # callers queue on this semaphore instead, for at most pool_timeout seconds
+        self._pool_slots = threading.BoundedSemaphore(maxconn)
+        self._pool_timeout = pool_timeout
+        if init_schema:
+            self.init_database()
+
+        # users.last_activity writes are coalesced in memory and flushed in one batch
+        self._activity_buffer = {}
+        self._activity_lock = threading.Lock()
+        self._activity_flush_interval = activity_flush_interval
+        flusher = threading.Thread(target=self._flush_activity_loop, name="user-activity-flush", daemon=True)
+        flusher.start()
 
+    @contextmanager
     def get_connection(self):
-        return psycopg2.connect(self.database_url, cursor_factory=psycopg2.extras.RealDictCursor)
+        """Check a connection out of the pool; commit on success, roll back on error"""
+        if not self._pool_slots.acquire(timeout=self._pool_timeout):
+            raise psycopg2.pool.PoolError(f"no database connection free after {self._pool_timeout}s")
+        try:
+            conn = self._pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                # A connection the server dropped is discarded rather than handed out again
+                self._pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self._pool_slots.release()
+
+    def close_all(self):
+        """Flush buffered activity, then close every pooled connection"""
+        if not self._pool.closed:
+            self.flush_user_activity()
+            self._pool.closeall()
+
+    def touch_user(self, address: str):
+        """Record user activity; persisted by the next flush"""
+        with self._activity_lock:
+            self._activity_buffer[address] = time.time()
+
+    def flush_user_activity(self):
+        """Write all buffered last_activity timestamps with a single UPDATE"""
+        with self._activity_lock:
+            pending, self._activity_buffer = self._activity_buffer, {}
+        if not pending:
+            return
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, """
+                        UPDATE users AS u SET last_activity = to_timestamp(v.ts)
+                        FROM (VALUES %s) AS v (address, ts)
+                        WHERE u.address = v.address
+                    """, list(pending.items()), page_size=500)
+        except Exception as e:
+            logger.error(f"User activity flush error: {e}")
+
+    def _flush_activity_loop(self):
+        while True:
+            time.sleep(self._activity_flush_interval)
+            self.flush_user_activity()
+
+    @contextmanager
+    def get_tuple_cursor(self):
+        """Plain tuple cursor for scalar lookups that never leave the model layer"""
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+                yield cur
+
+    def commit(self, conn, durable=True):
+        """Commit conn; with durable=False the commit returns before its WAL record is flushed.
+
+        A crash can then lose the last few such transactions, but never leaves
+        them half-applied, so it is only used for rows that are re-validated later.
+        """
+        if not durable:
+            with conn.cursor() as cur:
+                cur.execute("SET LOCAL synchronous_commit = off")
+        conn.commit()
+
+    def execute_prepared(self, cur, name, params):
+        """Run one of PREPARED_STATEMENTS, preparing it first on this connection if needed.
+
+        Prepared statements live in the server session, so they survive across
+        transactions on the same pooled connection and are planned only once.
+        """
+        conn = cur.connection
+        if name not in conn.prepared:
+            cur.execute(f"PREPARE {name} AS {PREPARED_STATEMENTS[name]}")
+            conn.prepared.add(name)
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+    def bulk_insert_transactions(self, cur, rows):
+        """Insert confirmed transactions in bulk; rows follow TRANSACTION_COLUMNS.
+
+        All writes to the transactions table go through here: multi-row INSERT
+        pages for normal blocks, COPY FROM STDIN for very large ones.
+        """
+        columns = ", ".join(TRANSACTION_COLUMNS)
+        if len(rows) > COPY_THRESHOLD:
+            buf = io.StringIO()
+            csv.writer(buf).writerows(rows)
+            buf.seek(0)
+            cur.copy_expert(f"COPY transactions ({columns}) FROM STDIN WITH (FORMAT csv)", buf)
+        elif rows:
+            execute_values(cur, f"INSERT INTO transactions ({columns}) VALUES %s", rows, page_size=500)
 
     def init_database(self):
         """Initialize enhanced database schema"""
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                # Users with enhanced features
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS users (
-                        id SERIAL PRIMARY KEY,
-                        address VARCHAR(255) UNIQUE NOT NULL,
-                        password_hash TEXT NOT NULL,
-                        is_authorized_minter BOOLEAN DEFAULT FALSE,
-                        reputation_score INTEGER DEFAULT 100,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Enhanced Blocks table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS blocks (
-                        id SERIAL PRIMARY KEY,
-                        index INTEGER UNIQUE NOT NULL,
-                        hash VARCHAR(64) UNIQUE NOT NULL,
-                        previous_hash VARCHAR(64) NOT NULL,
-                        miner VARCHAR(255) NOT NULL,
-                        nonce BIGINT NOT NULL,
-                        difficulty INTEGER NOT NULL,
-                        timestamp DOUBLE PRECISION NOT NULL,
-                        mining_time DOUBLE PRECISION DEFAULT 0,
-                        block_size INTEGER DEFAULT 0,
-                        total_fees DECIMAL(20, 8) DEFAULT 0,
-                        validation_status VARCHAR(20) DEFAULT 'pending',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Enhanced Transactions table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS transactions (
-                        id SERIAL PRIMARY KEY,
-                        tx_id VARCHAR(36) UNIQUE NOT NULL,
-                        block_index INTEGER REFERENCES blocks(index),
-                        sender VARCHAR(255) NOT NULL,
-                        receiver VARCHAR(255) NOT NULL,
-                        amount DECIMAL(20, 8) NOT NULL,
-                        fee DECIMAL(20, 8) DEFAULT 0,
-                        coin_type VARCHAR(50) NOT NULL,
-                        transaction_type VARCHAR(50) NOT NULL,
-                        metadata JSONB,
-                        timestamp DOUBLE PRECISION NOT NULL,
-                        validation_status VARCHAR(20) DEFAULT 'pending',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Stable coins (unchanged)
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS stable_coins (
-                        id SERIAL PRIMARY KEY,
-                        symbol VARCHAR(20) UNIQUE NOT NULL,
-                        name VARCHAR(100) NOT NULL,
-                        collateral_ratio DECIMAL(10, 4) NOT NULL,
-                        backed_by VARCHAR(50) NOT NULL,
-                        max_supply DECIMAL(20, 8),
-                        total_supply DECIMAL(20, 8) DEFAULT 0,
-                        creation_date DOUBLE PRECISION NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Enhanced Balances table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS balances (
-                        id SERIAL PRIMARY KEY,
-                        address VARCHAR(255) NOT NULL,
-                        coin_type VARCHAR(50) NOT NULL,
-                        balance DECIMAL(20, 8) DEFAULT 0,
-                        frozen_balance DECIMAL(20, 8) DEFAULT 0,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(address, coin_type)
-                    )
-                """)
-
-                # Authorized minters (unchanged)
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS authorized_minters (
-                        id SERIAL PRIMARY KEY,
-                        coin_symbol VARCHAR(20) NOT NULL REFERENCES stable_coins(symbol),
-                        minter_address VARCHAR(255) NOT NULL,
-                        authorizer VARCHAR(255) NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(coin_symbol, minter_address)
-                    )
-                """)
-
-                # Enhanced Pending transactions table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS pending_transactions (
-                        id SERIAL PRIMARY KEY,
-                        tx_id VARCHAR(36) UNIQUE NOT NULL,
-                        sender VARCHAR(255) NOT NULL,
-                        receiver VARCHAR(255) NOT NULL,
-                        amount DECIMAL(20, 8) NOT NULL,
-                        fee DECIMAL(20, 8) DEFAULT 0,
-                        coin_type VARCHAR(50) NOT NULL,
-                        transaction_type VARCHAR(50) NOT NULL,
-                        metadata JSONB,
-                        timestamp DOUBLE PRECISION NOT NULL,
-                        priority_score INTEGER DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                    ALTER TABLE pending_transactions ADD COLUMN IF NOT EXISTS priority_score INTEGER DEFAULT 0;
-                """)
-
-                # Chain statistics table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS chain_stats (
-                        id SERIAL PRIMARY KEY,
-                        block_index INTEGER UNIQUE NOT NULL,
-                        current_difficulty INTEGER NOT NULL,
-                        current_reward DECIMAL(20, 8) NOT NULL,
-                        avg_block_time DOUBLE PRECISION DEFAULT 0,
-                        hash_rate DOUBLE PRECISION DEFAULT 0,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Mining attempts table for difficulty calculation
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS mining_attempts (
-                        id SERIAL PRIMARY KEY,
-                        block_index INTEGER NOT NULL,
-                        miner VARCHAR(255) NOT NULL,
-                        start_time DOUBLE PRECISION NOT NULL,
-                        end_time DOUBLE PRECISION,
-                        success BOOLEAN DEFAULT FALSE,
-                        attempts_count BIGINT DEFAULT 0
-                    )
-                """)
-
-                # Ensure reputation_score and last_activity columns exist in users table
-                cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS reputation_score INTEGER DEFAULT 100")
-                cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                
-                # Ensure fee column exists in pending_transactions table
-                cur.execute("ALTER TABLE pending_transactions ADD COLUMN IF NOT EXISTS fee DECIMAL(20, 8) DEFAULT 0")
-
-                # Enhanced Indexes
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_blocks_hash ON blocks(hash)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_blocks_miner ON blocks(miner)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_blocks_timestamp ON blocks(timestamp)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_transactions_block ON transactions(block_index)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_transactions_sender ON transactions(sender)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_transactions_receiver ON transactions(receiver)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_transactions_timestamp ON transactions(timestamp)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_balances_address ON balances(address)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_pending_priority ON pending_transactions(priority_score DESC)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_chain_stats_block ON chain_stats(block_index)")
-
-                # Initialize CAD-COIN if not present
-                cur.execute("""
-                    INSERT INTO stable_coins (symbol, name, collateral_ratio, backed_by, creation_date)
-                    VALUES ('CAD-COIN', 'CAD-COIN', 1.0000, 'CAD', %s)
-                    ON CONFLICT (symbol) DO NOTHING
-                """, (time.time(),))
-
+                cur.execute(SCHEMA_SQL, {"now": time.time()})
                 conn.commit()
-                logger.info("Enhanced database initialized successfully")
\ No newline at end of file
+                logger.info("Enhanced database initialized successfully")
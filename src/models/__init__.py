@@ -1,6 +1,7 @@
 # Models module
-from .transaction import Transaction
+from .coin import CoinSymbol
+from .transaction import Transaction, to_amount
 from .block import Block
 from .blockchain import UltraRobustBlockchain
 
-__all__ = ['Transaction', 'Block', 'UltraRobustBlockchain']
\ No newline at end of file
+__all__ = ['CoinSymbol', 'Transaction', 'to_amount', 'Block', 'UltraRobustBlockchain']
\ No newline at end of file
@@ -6,16 +6,87 @@ Block model for CAD-COIN Blockchain
 """
 
 import time
-import json
+import queue
 import hashlib
 import logging
+import multiprocessing
 from typing import List, Tuple
 from .transaction import Transaction
+from ..utils import dumps_canonical
 
 logger = logging.getLogger(__name__)
 
+# Mining workers fork from a clean server process with this module already imported,
+# never from a request-serving process that holds threads and open sockets
+_start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+_mp_context = multiprocessing.get_context(_start_method)
+if _start_method == "forkserver":
+    _mp_context.set_forkserver_preload([__name__])
+
+NONCE_BLOCK = 1000  # Nonces sharing every decimal digit but the last three
+STOP_CHECK_INTERVAL = 4 * NONCE_BLOCK  # Attempts between stop/deadline checks in a mining worker
+PROGRESS_LOG_INTERVAL = 100 * NONCE_BLOCK  # Attempts between progress logs/timeout checks when mining in-process
+
+# Decimal spellings of a nonce's last three digits: zero-padded after a leading
+# part, plain for nonces below NONCE_BLOCK (no leading zeros)
+_LOW_DIGITS = tuple(b"%03d" % low for low in range(NONCE_BLOCK))
+_SMALL_NONCES = tuple(b"%d" % low for low in range(NONCE_BLOCK))
+
+
+def _target_bound(difficulty: int) -> bytes:
+    """Digests strictly below this 32-byte big-endian bound have `difficulty` leading zero hex digits"""
+    if difficulty <= 0:
+        return b"\xff" * 33  # Longer than any digest, so every digest compares below it
+    return (1 << (256 - 4 * min(difficulty, 64))).to_bytes(32, "big")
+
+
+def _mine_range(midstate, target: bytes, first_block: int, stride: int, count: int):
+    """Proof-of-work kernel: test `count` blocks of NONCE_BLOCK nonces, from block
+    `first_block` in steps of `stride` blocks.
+
+    Returns the winning (nonce, hash) or None. The leading digits of a nonce block
+    are hashed once into a second midstate, so each attempt is one midstate copy,
+    one three-byte update from a precomputed table and one raw digest compare
+    against the target bound; only the winner is hex-encoded.
+    """
+    for block in range(first_block, first_block + count * stride, stride):
+        if block:
+            block_state = midstate.copy()
+            block_state.update(b"%d" % block)
+            digits = _LOW_DIGITS
+        else:
+            block_state = midstate
+            digits = _SMALL_NONCES
+        copy = block_state.copy
+        for low, suffix in enumerate(digits):
+            hasher = copy()
+            hasher.update(suffix)
+            if hasher.digest() < target:
+                return block * NONCE_BLOCK + low, hasher.hexdigest()
+    return None
+
+
+def _search_nonces(prefix: bytes, target: bytes, start: int, stride: int, deadline: float,
+                   stop_event, results):
+    """Mining worker: try nonce blocks start, start + stride, ... until a hit, a stop or the deadline"""
+    midstate = hashlib.sha256(prefix)
+    blocks_per_check = STOP_CHECK_INTERVAL // NONCE_BLOCK
+    block = start
+    while not stop_event.is_set() and time.time() < deadline:
+        hit = _mine_range(midstate, target, block, stride, blocks_per_check)
+        if hit is not None:
+            stop_event.set()
+            results.put(hit)
+            return
+        block += stride * blocks_per_check
+    results.put((None, None))
+
 
 class Block:
+    __slots__ = ("index", "transactions", "previous_hash", "miner", "timestamp", "_difficulty",
+                 "nonce", "hash", "mining_time", "max_mining_time", "block_size",
+                 "_total_fees", "_tx_payload", "_target", "_target_bytes")
+
     def __init__(self, index: int, transactions: List[Transaction], previous_hash: str,
                  miner: str, difficulty: int = 4, max_mining_time: int = 300):
         self.index = index
@@ -29,75 +100,158 @@ class Block:
         self.mining_time = 0
         self.max_mining_time = max_mining_time
         self.block_size = len(transactions)
-        self.total_fees = sum(tx.fee for tx in transactions)
+        self._total_fees = None
+        self._tx_payload = None
 
-    def calculate_hash(self):
+    @property
+    def difficulty(self) -> int:
+        return self._difficulty
+
+    @difficulty.setter
+    def difficulty(self, value: int):
+        # Targets are derived once per difficulty, not on every mining or validation call
+        self._difficulty = value
+        self._target = "0" * value
+        self._target_bytes = _target_bound(value)
+
+    @property
+    def total_fees(self):
+        """Sum of transaction fees, computed only when the block is persisted or serialized"""
+        if self._total_fees is None:
+            self._total_fees = sum(tx.fee for tx in self.transactions)
+        return self._total_fees
+
+    def _transactions_payload(self) -> bytes:
+        """Canonical JSON of the transactions, serialized once per block"""
+        if self._tx_payload is None:
+            self._tx_payload = dumps_canonical([tx.to_dict() for tx in self.transactions])
+        return self._tx_payload
+
+    def _header_prefix(self) -> bytes:
+        """Serialized block contents minus the nonce, which is hashed last"""
         block_data = {
             "index": self.index,
-            "transactions": [tx.to_dict() for tx in self.transactions],
             "previous_hash": self.previous_hash,
             "miner": self.miner,
-            "timestamp": self.timestamp,
-            "nonce": self.nonce
+            "timestamp": self.timestamp
         }
-        return hashlib.sha256(json.dumps(block_data, sort_keys=True).encode()).hexdigest()
+        # "transactions" sorts after every header key, so splicing the cached payload
+        # in as the last member yields exactly the canonical encoding of the whole block
+        header = dumps_canonical(block_data)
+        return header[:-1] + b',"transactions":' + self._transactions_payload() + b"}"
+
+    def calculate_hash(self):
+        hasher = hashlib.sha256(self._header_prefix())
+        hasher.update(b"%d" % self.nonce)
+        return hasher.hexdigest()
 
-    def mine_block(self) -> bool:
-        """Enhanced mining with timeout protection"""
-        target = "0" * self.difficulty
+    def mine_block(self, workers: int = 1, in_process: bool = True) -> bool:
+        """Enhanced mining with timeout protection.
+
+        With in_process=False even a single worker searches in a child process, so the
+        nonce loop never holds the caller's GIL while its other threads serve requests.
+        """
+        if workers > 1 or not in_process:
+            return self._mine_parallel(max(workers, 1))
+
+        target = self._target_bytes
         start_time = time.time()
         attempt_count = 0
 
+        # The prefix never changes while mining: hash it once and only feed the nonce per attempt
+        midstate = hashlib.sha256(self._header_prefix())
+
         logger.info(f"Starting mining block {self.index} with difficulty {self.difficulty}")
         
         while True:
-            self.hash = self.calculate_hash()
-            if self.hash.startswith(target):
+            hit = _mine_range(midstate, target, self.nonce // NONCE_BLOCK, 1, PROGRESS_LOG_INTERVAL // NONCE_BLOCK)
+            if hit is not None:
+                attempt_count += hit[0] - self.nonce
+                self.nonce, self.hash = hit
                 end_time = time.time()
                 self.mining_time = end_time - start_time
                 logger.info(f"Block {self.index} mined! Hash: {self.hash}, Nonce: {self.nonce}, Time: {self.mining_time:.2f}s, Attempts: {attempt_count}")
                 return True
             
-            self.nonce += 1
-            attempt_count += 1
+            self.nonce += PROGRESS_LOG_INTERVAL
+            attempt_count += PROGRESS_LOG_INTERVAL
 
             # Progress logging
-            if attempt_count % 100000 == 0:
-                elapsed_time = time.time() - start_time
-                hash_rate = attempt_count / elapsed_time
-                logger.info(f"Mining progress - Block {self.index}: {attempt_count} attempts, {hash_rate:.2f} H/s, {elapsed_time:.1f}s elapsed")
-                
-                # Timeout protection
-                if elapsed_time > self.max_mining_time:
-                    logger.warning(f"Mining timeout for block {self.index} after {elapsed_time:.1f}s")
-                    return False
-
-        return False
+            elapsed_time = time.time() - start_time
+            hash_rate = attempt_count / elapsed_time
+            logger.info(f"Mining progress - Block {self.index}: {attempt_count} attempts, {hash_rate:.2f} H/s, {elapsed_time:.1f}s elapsed")
+            
+            # Timeout protection
+            if elapsed_time > self.max_mining_time:
+                logger.warning(f"Mining timeout for block {self.index} after {elapsed_time:.1f}s")
+                return False
+
+    def _mine_parallel(self, workers: int) -> bool:
+        """Split the nonce space into interleaved strides of nonce blocks, one per worker process"""
+        target = self._target_bytes
+        prefix = self._header_prefix()
+        start_time = time.time()
+        deadline = start_time + self.max_mining_time
+
+        logger.info(f"Starting mining block {self.index} with difficulty {self.difficulty} on {workers} workers")
+
+        stop_event = _mp_context.Event()
+        results = _mp_context.Queue()
+        processes = [
+            _mp_context.Process(target=_search_nonces,
+                                args=(prefix, target, i, workers, deadline, stop_event, results),
+                                daemon=True)
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        found = None
+        try:
+            # Every worker reports exactly once: its hit, or (None, None) when stopped or out of time
+            for _ in range(workers):
+                nonce, digest = results.get(timeout=max(0.0, deadline - time.time()) + 5)
+                if nonce is not None:
+                    found = (nonce, digest)
+                    break
+        except queue.Empty:
+            logger.warning(f"Mining workers for block {self.index} stopped reporting")
+        finally:
+            stop_event.set()
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        if found is None:
+            logger.warning(f"Mining timeout for block {self.index} after {time.time() - start_time:.1f}s")
+            return False
+
+        self.nonce, self.hash = found
+        self.mining_time = time.time() - start_time
+        logger.info(f"Block {self.index} mined! Hash: {self.hash}, Nonce: {self.nonce}, Time: {self.mining_time:.2f}s, Workers: {workers}")
+        return True
 
     def is_valid(self, expected_previous_hash: str) -> Tuple[bool, str]:
-        """Enhanced block validation"""
+        """Enhanced block validation; cheap checks first, the hash recomputation last"""
         if self.previous_hash != expected_previous_hash:
             return False, f"Invalid previous hash. Expected: {expected_previous_hash}, Got: {self.previous_hash}"
         
-        if not self.hash or not self.hash.startswith("0" * self.difficulty):
-            return False, "Invalid block hash or difficulty"
-        
-        if self.calculate_hash() != self.hash:
-            return False, "Block hash verification failed"
-        
         if len(self.transactions) == 0:
             return False, "Block cannot be empty"
         
-        # Allow blocks with only mining reward transaction
-        if len(self.transactions) == 1 and self.transactions[0].transaction_type == "mining_reward":
-            pass  # Valid empty block with just mining reward
+        if not self.hash or not self.hash.startswith(self._target):
+            return False, "Invalid block hash or difficulty"
         
-        # Validate all transactions
+        # Validate all transactions, stopping at the first invalid one
         for tx in self.transactions:
             is_valid, error = tx.is_valid()
             if not is_valid:
                 return False, f"Invalid transaction {tx.id}: {error}"
         
+        if self.calculate_hash() != self.hash:
+            return False, "Block hash verification failed"
+        
         return True, "Valid"
 
     def to_dict(self):
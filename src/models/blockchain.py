@@ -6,21 +6,44 @@ Ultra Robust Blockchain Service for CAD-COIN
 """
 
 import time
-import json
+import fnmatch
 import hashlib
 import logging
-import math
+import threading
 import psycopg2
+from collections import defaultdict
+from decimal import Decimal
+from psycopg2.extras import execute_values
 from typing import Dict, List, Optional, Tuple
 
 from ..config import Config
 from ..database import DatabaseManager
 from ..cache import CacheManager
-from .transaction import Transaction
+from ..utils import dumps, dumps_text, loads
+from .coin import CoinSymbol
+from .transaction import Transaction, to_amount
 from .block import Block
 
 logger = logging.getLogger(__name__)
 
+GENESIS_HASH = hashlib.sha256(b"genesis_block_cad_coin_ultra_robust").hexdigest()
+CREDIT_ONLY_TYPES = ("mint_stable", "mining_reward")  # Transaction types that debit no sender balance
+MIN_MINING_REWARD = Decimal("0.1")  # Reward floor once halvings would go below it
+ZERO_BALANCE = Decimal("0E-8")  # Balance of an address with no balances row
+ASERT_RADIX = 1 << 16  # Fixed-point scale of the ASERT difficulty exponent
+PRIORITY_SCALE = 1000000  # priority_score units per coin of fee
+FEE_RATE = Decimal("0.001")  # Default fee as a fraction of the amount, above the minimum fee
+
+
+def priority_score(fee, timestamp: float) -> int:
+    """Stored mempool priority: fee plus one unit per hour waited.
+
+    fee + (now - timestamp) / 3600 ranks transactions exactly like
+    fee - timestamp / 3600 at any instant, so the score never goes stale
+    and can be indexed instead of recomputed on every read.
+    """
+    return round((float(fee) - timestamp / 3600) * PRIORITY_SCALE)
+
 
 class UltraRobustBlockchain:
     def __init__(self, db_manager: DatabaseManager, cache_manager: CacheManager):
@@ -29,86 +52,153 @@ class UltraRobustBlockchain:
         self.base_mining_reward = Config.BASE_MINING_REWARD
         self.base_difficulty = Config.BASE_DIFFICULTY
         self.max_difficulty = Config.MAX_DIFFICULTY
+        self.difficulty_halflife = Config.DIFFICULTY_HALFLIFE
         self.difficulty_adjustment_interval = Config.DIFFICULTY_ADJUSTMENT_INTERVAL
         self.halving_interval = Config.HALVING_INTERVAL
         self.target_block_time = Config.TARGET_BLOCK_TIME
         self.max_pending_transactions = Config.MAX_PENDING_TRANSACTIONS
+        self.async_mempool_commit = Config.ASYNC_MEMPOOL_COMMIT
         self.min_transaction_fee = Config.MIN_TRANSACTION_FEE
+        self._min_fee = to_amount(self.min_transaction_fee)
+        # Amount above which the percentage fee exceeds the minimum fee
+        self._fee_pivot = self._min_fee / FEE_RATE
         self.max_block_size = Config.MAX_BLOCK_SIZE
         self.mining_timeout = Config.MINING_TIMEOUT
+        self.mining_workers = Config.MINING_WORKERS
         self.max_chain_reorg_depth = Config.MAX_CHAIN_REORG_DEPTH
         self.block_validation_depth = Config.BLOCK_VALIDATION_DEPTH
+
+        # Exact reward per halving epoch; past the last entry the reward is pinned at the floor
+        base_reward = Decimal(str(self.base_mining_reward))
+        self._reward_table = tuple(max(base_reward / (2 ** halvings), MIN_MINING_REWARD)
+                                   for halvings in range(64))
+
+        # (coin_symbol, minter) pairs known to be authorized. Grants are never revoked,
+        # so only positive answers are kept and they cannot go stale across workers
+        self._authorized_minters = set()
+
+        # symbol -> (max_supply, total_supply) of known stablecoins. Coins are never deleted,
+        # max_supply never changes and total_supply only grows, so a cached total is a lower
+        # bound: it can reject mints that are certainly over the cap, never admit one
+        self._stable_coin_supplies = {}
+        self._stable_coin_lock = threading.Lock()
+
+        # In-process chain tip {"index", "hash", "timestamp", "solvetime", "difficulty_fp"};
+        # dropped whenever any worker invalidates latest_block
+        self._tip = None
+        self._tip_generation = 0
+        self._tip_lock = threading.Lock()
+        self.cache.add_invalidation_callback(self._on_cache_invalidation)
+
         self.init_genesis_block()
 
+    def _on_cache_invalidation(self, key: str):
+        if fnmatch.fnmatchcase("latest_block", key):
+            self._reset_tip()
+
+    def _reset_tip(self):
+        with self._tip_lock:
+            self._tip = None
+            self._tip_generation += 1
+
+    def _set_tip(self, tip: dict, generation: int = None):
+        """Install a tip unless it was invalidated since `generation` was read"""
+        with self._tip_lock:
+            if generation is None or generation == self._tip_generation:
+                self._tip = tip
+
+    def _get_tip(self):
+        """Chain tip from memory, loading it from the database on a miss"""
+        with self._tip_lock:
+            if self._tip is not None:
+                return self._tip
+            generation = self._tip_generation
+        with self.db.get_tuple_cursor() as cur:
+            cur.execute("""
+                SELECT b.index, b.hash, b.timestamp, b.timestamp - p.timestamp,
+                       COALESCE(cs.difficulty_fp, b.difficulty::bigint * %s)
+                FROM blocks b
+                LEFT JOIN blocks p ON p.index = b.index - 1
+                LEFT JOIN chain_stats cs ON cs.block_index = b.index
+                ORDER BY b.index DESC
+                LIMIT 1
+            """, (ASERT_RADIX,))
+            row = cur.fetchone()
+        if row is None:
+            return None
+        tip = {"index": row[0], "hash": row[1], "timestamp": float(row[2]),
+               "solvetime": None if row[3] is None else float(row[3]), "difficulty_fp": row[4]}
+        self._set_tip(tip, generation)
+        return tip
+
     def init_genesis_block(self):
-        """Create genesis block if missing"""
+        """Create genesis block if missing.
+
+        Every app worker runs this at boot, so on a fresh database several can
+        get past the COUNT(*) together; ON CONFLICT lets the losers no-op.
+        """
         with self.db.get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT COUNT(*) AS c FROM blocks")
                 if int(cur.fetchone()["c"]) == 0:
-                    genesis_hash = hashlib.sha256("genesis_block_cad_coin_ultra_robust".encode()).hexdigest()
                     cur.execute("""
                         INSERT INTO blocks (index, hash, previous_hash, miner, nonce, difficulty, timestamp, validation_status)
                         VALUES (0, %s, '0', 'genesis', 0, %s, %s, 'validated')
-                    """, (genesis_hash, self.base_difficulty, time.time()))
+                        ON CONFLICT DO NOTHING
+                    """, (GENESIS_HASH, self.base_difficulty, time.time()))
+                    created = cur.rowcount == 1
                     
                     # Initialize chain stats for genesis block
                     cur.execute("""
-                        INSERT INTO chain_stats (block_index, current_difficulty, current_reward, avg_block_time)
-                        VALUES (0, %s, %s, 0)
-                    """, (self.base_difficulty, self.base_mining_reward))
+                        INSERT INTO chain_stats (block_index, current_difficulty, current_reward, avg_block_time,
+                                                 difficulty_fp)
+                        VALUES (0, %s, %s, 0, %s)
+                        ON CONFLICT (block_index) DO NOTHING
+                    """, (self.base_difficulty, self.base_mining_reward, self.base_difficulty * ASERT_RADIX))
                     
                     conn.commit()
-                    logger.info("Ultra robust genesis block created")
+                    if created:
+                        logger.info("Ultra robust genesis block created")
 
-    def calculate_current_difficulty(self) -> int:
-        """Calculate adaptive difficulty based on recent block times"""
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
-                # Get the latest blocks for difficulty calculation
-                cur.execute("""
-                    SELECT timestamp, difficulty FROM blocks 
-                    ORDER BY index DESC 
-                    LIMIT %s
-                """, (self.difficulty_adjustment_interval + 1,))
-                
-                blocks = cur.fetchall()
-                
-                if len(blocks) < self.difficulty_adjustment_interval:
-                    return self.base_difficulty
-                
-                # Calculate average block time
-                total_time = blocks[0]["timestamp"] - blocks[-1]["timestamp"]
-                avg_time = total_time / len(blocks)
-                expected_time = self.target_block_time
-                
-                current_difficulty = blocks[0]["difficulty"]
-                
-                # Adjust difficulty based on performance
-                if avg_time < expected_time * 0.5:  # Too fast, increase difficulty
-                    new_difficulty = min(current_difficulty + 2, self.max_difficulty)
-                elif avg_time < expected_time * 0.8:  # Slightly fast, increase difficulty
-                    new_difficulty = min(current_difficulty + 1, self.max_difficulty)
-                elif avg_time > expected_time * 2.0:  # Too slow, decrease difficulty
-                    new_difficulty = max(current_difficulty - 2, self.base_difficulty)
-                elif avg_time > expected_time * 1.5:  # Slightly slow, decrease difficulty
-                    new_difficulty = max(current_difficulty - 1, self.base_difficulty)
-                else:  # Within acceptable range
-                    new_difficulty = current_difficulty
-                
-                logger.info(f"Difficulty adjustment: avg_time={avg_time:.2f}s, target={expected_time}s, "
-                           f"current={current_difficulty}, new={new_difficulty}")
-                
-                return new_difficulty
+    def calculate_current_difficulty(self, tip: dict = None) -> int:
+        """Difficulty of the block after `tip` (default: the current chain tip)"""
+        difficulty_fp = self._next_difficulty_fp(tip)
+        return (difficulty_fp + ASERT_RADIX // 2) // ASERT_RADIX
+
+    def _next_difficulty_fp(self, tip: dict = None) -> int:
+        """Exact difficulty of the block after `tip`, in 1/ASERT_RADIX digits.
+
+        Relative ASERT (see zawy12's difficulty notes): each block scales the
+        previous target by 2 ** ((solvetime - T) / halflife). Difficulty counts
+        leading zero hex digits, i.e. it is already -log16(target), so the
+        exponential becomes a straight line with no approximation:
+
+            difficulty = tip_difficulty - (solvetime - T) / (4 * halflife)
+
+        The fixed-point value is stored per block, so rounding to whole digits
+        for mining never accumulates. Only the tip's own solve time is used, so
+        an idle stretch lowers difficulty once instead of leaving a schedule
+        debt that pins it at the floor.
+        """
+        if tip is None:
+            tip = self._get_tip()
+        if tip is None:
+            return self.base_difficulty * ASERT_RADIX
+
+        difficulty_fp = tip["difficulty_fp"]
+        if tip["solvetime"] is not None:
+            excess = round(tip["solvetime"]) - self.target_block_time
+            difficulty_fp -= excess * ASERT_RADIX // (4 * self.difficulty_halflife)
+
+        return max(self.base_difficulty * ASERT_RADIX, min(difficulty_fp, self.max_difficulty * ASERT_RADIX))
 
     def calculate_mining_reward(self, block_index: int) -> float:
         """Calculate progressive mining reward with halving"""
-        halvings = block_index // self.halving_interval
-        reward = self.base_mining_reward / (2 ** halvings)
-        
-        # Minimum reward floor
-        min_reward = 0.1
-        return max(reward, min_reward)
+        return float(self._block_reward(block_index))
+
+    def _block_reward(self, block_index: int) -> Decimal:
+        """Exact base reward for block_index, looked up by halving epoch"""
+        return self._reward_table[min(block_index // self.halving_interval, len(self._reward_table) - 1)]
 
     def validate_chain_integrity(self, depth: int = None) -> Tuple[bool, str]:
         """Validate blockchain integrity"""
@@ -116,49 +206,38 @@ class UltraRobustBlockchain:
             depth = self.block_validation_depth
             
         try:
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT * FROM blocks 
-                        ORDER BY index DESC 
-                        LIMIT %s
-                    """, (depth,))
-                    
-                    blocks = list(cur.fetchall())
-                    
-                    if not blocks:
-                        return True, "No blocks to validate"
-                    
-                    # Validate each block in reverse order (latest first)
-                    for i in range(len(blocks)):
-                        block = blocks[i]
-                        
-                        # Skip genesis block
-                        if block["index"] == 0:
-                            continue
-                            
-                        # Find previous block
-                        previous_block = None
-                        for j in range(i + 1, len(blocks)):
-                            if blocks[j]["index"] == block["index"] - 1:
-                                previous_block = blocks[j]
-                                break
-                        
-                        if not previous_block:
-                            # Need to fetch from database
-                            cur.execute("""
-                                SELECT * FROM blocks WHERE index = %s
-                            """, (block["index"] - 1,))
-                            previous_block = cur.fetchone()
-                        
-                        if not previous_block:
-                            return False, f"Missing previous block for block {block['index']}"
-                        
-                        if block["previous_hash"] != previous_block["hash"]:
-                            return False, f"Chain integrity violation at block {block['index']}"
-                    
-                    return True, "Chain integrity validated"
-                    
+            with self.db.get_tuple_cursor() as cur:
+                # One extra row brings in the predecessor of the oldest validated block
+                cur.execute("""
+                    SELECT index, hash, previous_hash FROM blocks 
+                    ORDER BY index DESC 
+                    LIMIT %s
+                """, (depth + 1,))
+
+                rows = cur.fetchall()
+                blocks = rows[:depth]
+
+                if not blocks:
+                    return True, "No blocks to validate"
+
+                hash_by_index = {index: block_hash for index, block_hash, _ in rows}
+
+                # Validate each block in reverse order (latest first)
+                for index, _, previous_hash in blocks:
+                    # Skip genesis block
+                    if index == 0:
+                        continue
+
+                    # Rows are the newest depth + 1 blocks, so a miss here is a real gap
+                    expected_hash = hash_by_index.get(index - 1)
+                    if expected_hash is None:
+                        return False, f"Missing previous block for block {index}"
+
+                    if previous_hash != expected_hash:
+                        return False, f"Chain integrity violation at block {index}"
+
+                return True, "Chain integrity validated"
+
         except Exception as e:
             logger.error(f"Chain integrity validation error: {e}")
             return False, f"Validation error: {str(e)}"
@@ -170,27 +249,34 @@ class UltraRobustBlockchain:
             
         with self.db.get_connection() as conn:
             with conn.cursor() as cur:
+                # Ordered exactly like idx_pending_priority_fee: an index scan that stops at LIMIT
                 cur.execute("""
                     SELECT *, 
                            (fee + (EXTRACT(EPOCH FROM NOW()) - timestamp) / 3600) as priority
                     FROM pending_transactions 
-                    ORDER BY priority DESC, created_at ASC
+                    ORDER BY priority_score DESC, fee DESC, timestamp ASC
                     LIMIT %s
                 """, (limit,))
                 
                 return [dict(row) for row in cur.fetchall()]
 
-    def create_transaction(self, sender: str, receiver: str, amount: float, 
-                          coin_type: str = "CAD-COIN", fee: float = None) -> Tuple[bool, str]:
+    def _default_fee(self, amount: Decimal) -> Decimal:
+        """0.1% of the amount, or the minimum fee for small amounts"""
+        return amount * FEE_RATE if amount > self._fee_pivot else self._min_fee
+
+    def create_transaction(self, sender: str, receiver: str, amount,
+                          coin_type: str = "CAD-COIN", fee=None) -> Tuple[bool, str]:
         """Enhanced transaction creation with fee calculation"""
-        amount = float(amount)
-        if fee is None:
-            fee = max(self.min_transaction_fee, amount * 0.001)  # 0.1% fee or minimum
+        try:
+            amount = to_amount(amount)
+            fee = self._default_fee(amount) if fee is None else to_amount(fee)
+        except ValueError:
+            return False, "Invalid amount"
         
         if amount <= 0:
             return False, "Amount must be positive"
         
-        if fee < self.min_transaction_fee:
+        if fee < self._min_fee:
             return False, f"Fee too low. Minimum: {self.min_transaction_fee}"
 
         try:
@@ -199,34 +285,27 @@ class UltraRobustBlockchain:
             if self.get_balance(sender, coin_type) < total_required:
                 return False, f"Insufficient balance. Required: {total_required} (amount + fee)"
 
-            # Check pending transaction limit
-            pending_count = len(self.get_pending_transactions())
-            if pending_count >= self.max_pending_transactions:
-                return False, "Too many pending transactions"
+            tx = Transaction(sender, receiver, amount, coin_type, fee=fee)
+
+            # Validate transaction
+            is_valid, error = tx.is_valid()
+            if not is_valid:
+                return False, error
 
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    # Check coin exists
-                    cur.execute("SELECT symbol FROM stable_coins WHERE symbol = %s", (coin_type,))
-                    if not cur.fetchone():
-                        return False, "Coin type does not exist"
-
-                    tx = Transaction(sender, receiver, amount, coin_type, fee=fee)
-                    
-                    # Validate transaction
-                    is_valid, error = tx.is_valid()
-                    if not is_valid:
-                        return False, error
-
-                    cur.execute("""
-                        INSERT INTO pending_transactions 
-                        (tx_id, sender, receiver, amount, fee, coin_type, transaction_type, metadata, timestamp, priority_score)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (tx.id, tx.sender, tx.receiver, tx.amount, tx.fee, tx.coin_type, 
-                          tx.transaction_type, json.dumps(tx.metadata), tx.timestamp, 
-                          int(fee * 1000)))  # Priority based on fee
-
-                    conn.commit()
+                    # Coin existence and the pending transaction limit are checked by the insert itself
+                    self.db.execute_prepared(cur, "admit_pending_tx", (
+                        tx.id, tx.sender, tx.receiver, tx.amount, tx.fee, tx.coin_type,
+                        tx.transaction_type, dumps_text(tx.metadata), tx.timestamp,
+                        priority_score(tx.fee, tx.timestamp), self.max_pending_transactions))
+                    if cur.rowcount == 0:
+                        cur.execute("SELECT 1 FROM stable_coins WHERE symbol = %s", (coin_type,))
+                        if not cur.fetchone():
+                            return False, "Coin type does not exist"
+                        return False, "Too many pending transactions"
+
+                    self.db.commit(conn, durable=not self.async_mempool_commit)
                     logger.info(f"Enhanced tx created: {sender} -> {receiver}, {amount} {coin_type}, fee: {fee}")
                     return True, "Transaction added to pending pool"
                     
@@ -241,191 +320,195 @@ class UltraRobustBlockchain:
             pending_txs_data = self.get_priority_pending_transactions()
             # Allow mining even without pending transactions (empty blocks with just mining reward)
 
+            # Chain tip: latest block index, hash and timestamp
+            tip = self._get_tip()
+            next_index = tip["index"] + 1
+
             # Calculate current difficulty and reward
-            current_difficulty = self.calculate_current_difficulty()
-            
+            difficulty_fp = self._next_difficulty_fp(tip)
+            current_difficulty = (difficulty_fp + ASERT_RADIX // 2) // ASERT_RADIX
+
+            mining_reward = self._block_reward(next_index)
+
+            # Build and mine the block before checking out a connection, so the
+            # database transaction only spans the writes
+            attempt_start = time.time()
+
+            # Rebuild Transaction objects from priority list
+            transactions: List[Transaction] = []
+            total_fees = Decimal(0)  # Summed exactly from the NUMERIC column values
+
+            # Sender balances for every debit in one lookup; a transfer its sender can no
+            # longer cover (counting the ones already picked for this block) is rejected and
+            # dropped from the pool, or it would keep its top priority and block every round
+            rejected_tx_ids = []
+            available = self.get_balances_bulk(
+                (txd["sender"], txd["coin_type"]) for txd in pending_txs_data
+                if txd["transaction_type"] not in CREDIT_ONLY_TYPES)
+
+            for txd in pending_txs_data:
+                if txd["transaction_type"] not in CREDIT_ONLY_TYPES:
+                    debit_key = (txd["sender"], txd["coin_type"])
+                    required = txd["amount"] + txd["fee"]
+                    if available[debit_key] < required:
+                        logger.warning(f"Rejecting tx {txd['tx_id']}: insufficient {txd['coin_type']} "
+                                       f"balance for {txd['sender']}")
+                        rejected_tx_ids.append(txd["tx_id"])
+                        continue
+                    available[debit_key] -= required
+
+                tx = Transaction(
+                    sender=txd["sender"],
+                    receiver=txd["receiver"],
+                    amount=txd["amount"],
+                    coin_type=txd["coin_type"],
+                    transaction_type=txd["transaction_type"],
+                    metadata=txd["metadata"] or {},
+                    fee=txd["fee"],
+                    tx_id=txd["tx_id"],
+                    timestamp=txd["timestamp"]
+                )
+                transactions.append(tx)
+                total_fees += txd["fee"]
+
+            # Enhanced mining reward includes fees
+            reward_tx = Transaction(
+                sender="mining_reward",
+                receiver=miner_address,
+                amount=mining_reward + total_fees,  # Base reward + transaction fees
+                coin_type="CAD-COIN",
+                transaction_type="mining_reward"
+            )
+            transactions.append(reward_tx)
+
+            # Create new block with adaptive difficulty
+            new_block = Block(
+                index=next_index,
+                transactions=transactions,
+                previous_hash=tip["hash"],
+                miner=miner_address,
+                difficulty=current_difficulty,
+                max_mining_time=self.mining_timeout
+            )
+
+            logger.info(f"Mining block {new_block.index} with {len(transactions)} txs, "
+                       f"difficulty {current_difficulty}, reward {mining_reward + total_fees}")
+
+            # Mine and validate the block
+            mined = new_block.mine_block(self.mining_workers, in_process=False)
+            error = None
+            if mined:
+                mined, error = new_block.is_valid(tip["hash"])
+
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    # Get latest block index
-                    cur.execute("SELECT COALESCE(MAX(index), -1) + 1 as next_index FROM blocks")
-                    next_index = cur.fetchone()["next_index"]
-                    
-                    mining_reward = self.calculate_mining_reward(next_index)
-                    
-                    # Record mining attempt
-                    attempt_start = time.time()
-                    cur.execute("""
-                        INSERT INTO mining_attempts (block_index, miner, start_time, attempts_count)
-                        VALUES (%s, %s, %s, 0)
-                    """, (next_index, miner_address, attempt_start))
-                    
-                    # Rebuild Transaction objects from priority list
-                    transactions: List[Transaction] = []
-                    total_fees = 0
-                    
-                    for txd in pending_txs_data:
-                        tx = Transaction(
-                            sender=txd["sender"],
-                            receiver=txd["receiver"],
-                            amount=float(txd["amount"]),
-                            coin_type=txd["coin_type"],
-                            transaction_type=txd["transaction_type"],
-                            metadata=txd["metadata"] or {},
-                            fee=float(txd["fee"])
-                        )
-                        tx.id = txd["tx_id"]
-                        tx.timestamp = float(txd["timestamp"])
-                        transactions.append(tx)
-                        total_fees += tx.fee
-
-                    # Enhanced mining reward includes fees
-                    reward_tx = Transaction(
-                        sender="mining_reward",
-                        receiver=miner_address,
-                        amount=mining_reward + total_fees,  # Base reward + transaction fees
-                        coin_type="CAD-COIN",
-                        transaction_type="mining_reward"
-                    )
-                    transactions.append(reward_tx)
-
-                    # Get latest block for previous hash
-                    latest_block = self.get_latest_block()
-                    
-                    # Create new block with adaptive difficulty
-                    new_block = Block(
-                        index=next_index,
-                        transactions=transactions,
-                        previous_hash=latest_block["hash"],
-                        miner=miner_address,
-                        difficulty=current_difficulty,
-                        max_mining_time=self.mining_timeout
-                    )
-
-                    logger.info(f"Mining block {new_block.index} with {len(transactions)} txs, "
-                               f"difficulty {current_difficulty}, reward {mining_reward + total_fees}")
-                    
-                    # Mine the block
-                    if new_block.mine_block():
-                        # Validate the new block
-                        is_valid, error = new_block.is_valid(latest_block["hash"])
-                        if not is_valid:
+                    if not mined:
+                        # Mining failed (timeout, other issue) or the block did not validate
+                        self.db.execute_prepared(cur, "insert_mining_attempt", (
+                            next_index, miner_address, attempt_start, time.time(), False, new_block.nonce))
+                        if rejected_tx_ids:
+                            cur.execute("DELETE FROM pending_transactions WHERE tx_id = ANY(%s)",
+                                        (rejected_tx_ids,))
+                        conn.commit()
+                        if error:
                             logger.error(f"Mined block validation failed: {error}")
                             return False, f"Block validation failed: {error}"
-                        
-                        # Persist block with enhanced data
-                        cur.execute("""
-                            INSERT INTO blocks 
-                            (index, hash, previous_hash, miner, nonce, difficulty, timestamp, 
-                             mining_time, block_size, total_fees, validation_status)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'validated')
-                        """, (new_block.index, new_block.hash, new_block.previous_hash,
-                              new_block.miner, new_block.nonce, new_block.difficulty, 
-                              new_block.timestamp, new_block.mining_time, new_block.block_size,
-                              new_block.total_fees))
-
-                        # Persist transactions with enhanced data
-                        for tx in transactions:
-                            cur.execute("""
-                                INSERT INTO transactions 
-                                (tx_id, block_index, sender, receiver, amount, fee, coin_type, 
-                                 transaction_type, metadata, timestamp, validation_status)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'validated')
-                            """, (tx.id, new_block.index, tx.sender, tx.receiver, tx.amount,
-                                  tx.fee, tx.coin_type, tx.transaction_type, 
-                                  json.dumps(tx.metadata), tx.timestamp))
-
-                        # Update balances with enhanced logic
-                        self.update_balances_enhanced(transactions, cur)
-
-                        # Update chain statistics
-                        cur.execute("""
-                            INSERT INTO chain_stats (block_index, current_difficulty, current_reward, avg_block_time, hash_rate)
-                            VALUES (%s, %s, %s, %s, %s)
-                        """, (new_block.index, current_difficulty, mining_reward,
-                              new_block.mining_time, new_block.nonce / new_block.mining_time if new_block.mining_time > 0 else 0))
+                        return False, "Mining failed or timed out"
 
-                        # Update mining attempt record
+                    # Persist block with enhanced data
+                    self.db.execute_prepared(cur, "insert_block", (
+                        new_block.index, new_block.hash, new_block.previous_hash,
+                        new_block.miner, new_block.nonce, new_block.difficulty,
+                        new_block.timestamp, new_block.mining_time, new_block.block_size,
+                        new_block.total_fees))
+
+                    # Persist transactions with enhanced data (batched)
+                    self.db.bulk_insert_transactions(cur, [
+                        (tx.id, new_block.index, tx.sender, tx.receiver, tx.amount,
+                         tx.fee, tx.coin_type, tx.transaction_type,
+                         dumps_text(tx.metadata), tx.timestamp, 'validated')
+                        for tx in transactions
+                    ])
+
+                    # Update balances with enhanced logic
+                    self.update_balances_enhanced(transactions, cur)
+
+                    # Update chain statistics
+                    self.db.execute_prepared(cur, "insert_chain_stats", (
+                        new_block.index, current_difficulty, mining_reward, new_block.mining_time,
+                        new_block.nonce / new_block.mining_time if new_block.mining_time > 0 else 0,
+                        difficulty_fp))
+
+                    # Record the successful mining attempt
+                    self.db.execute_prepared(cur, "insert_mining_attempt", (
+                        next_index, miner_address, attempt_start, time.time(), True, new_block.nonce))
+
+                    # Clear processed and rejected pending transactions
+                    processed_tx_ids = [tx.id for tx in transactions[:-1]] + rejected_tx_ids  # Exclude reward tx
+                    if processed_tx_ids:
                         cur.execute("""
-                            UPDATE mining_attempts 
-                            SET end_time = %s, success = TRUE, attempts_count = %s
-                            WHERE block_index = %s AND miner = %s
-                        """, (time.time(), new_block.nonce, next_index, miner_address))
-
-                        # Clear processed pending transactions
-                        processed_tx_ids = [tx.id for tx in transactions[:-1]]  # Exclude reward tx
-                        if processed_tx_ids:
-                            cur.execute("""
-                                DELETE FROM pending_transactions 
-                                WHERE tx_id = ANY(%s)
-                            """, (processed_tx_ids,))
+                            DELETE FROM pending_transactions 
+                            WHERE tx_id = ANY(%s)
+                        """, (processed_tx_ids,))
 
-                        conn.commit()
+                    conn.commit()
 
-                        # Invalidate relevant caches
-                        self.cache.invalidate_pattern("latest_block*")
-                        self.cache.invalidate_pattern("chain_info*")
-                        self.cache.invalidate_pattern(f"balance_{miner_address}*")
-
-                        logger.info(f"Block {new_block.index} successfully mined and validated. "
-                                   f"Reward: {mining_reward + total_fees} CAD-COIN, "
-                                   f"Time: {new_block.mining_time:.2f}s")
-                        
-                        return True, (f"Mined block {new_block.index}. "
-                                     f"Reward: {mining_reward + total_fees:.8f} CAD-COIN. "
-                                     f"Difficulty: {current_difficulty}, "
-                                     f"Time: {new_block.mining_time:.2f}s")
-                    else:
-                        # Mining failed (timeout or other issue)
-                        cur.execute("""
-                            UPDATE mining_attempts 
-                            SET end_time = %s, success = FALSE
-                            WHERE block_index = %s AND miner = %s
-                        """, (time.time(), next_index, miner_address))
-                        conn.commit()
-                        return False, "Mining failed or timed out"
+            # Invalidate relevant caches
+            self.cache.invalidate_patterns(
+                ["latest_block*", f"balance_{miner_address}*"],
+                keys=["enhanced_chain_info",
+                      *{f"balance_{address}_{tx.coin_type}"
+                        for tx in transactions
+                        for address in (tx.sender, tx.receiver)},
+                      *{f"balances_{address}"
+                        for tx in transactions
+                        for address in (tx.sender, tx.receiver)}])
+            self._set_tip({"index": new_block.index, "hash": new_block.hash, "timestamp": new_block.timestamp,
+                           "solvetime": new_block.timestamp - tip["timestamp"], "difficulty_fp": difficulty_fp})
+
+            logger.info(f"Block {new_block.index} successfully mined and validated. "
+                       f"Reward: {mining_reward + total_fees} CAD-COIN, "
+                       f"Time: {new_block.mining_time:.2f}s")
+
+            return True, (f"Mined block {new_block.index}. "
+                         f"Reward: {mining_reward + total_fees:.8f} CAD-COIN. "
+                         f"Difficulty: {current_difficulty}, "
+                         f"Time: {new_block.mining_time:.2f}s")
 
         except Exception as e:
+            # e.g. another worker extended the chain first: reload the tip next time
+            self._reset_tip()
             logger.error(f"Enhanced mining error: {e}")
             return False, f"Mining error: {str(e)}"
 
     def update_balances_enhanced(self, transactions: List[Transaction], cursor):
-        """Enhanced balance updates with fee handling"""
+        """Enhanced balance updates with fee handling, applied as one multi-row upsert"""
+        # Net every (address, coin) first: a single INSERT ... ON CONFLICT may not touch
+        # the same row twice, and one row per address means one HOT update each
+        # Exact decimal arithmetic, so offsetting transfers net to exactly zero
+        deltas = defaultdict(Decimal)
         for tx in transactions:
-            if tx.transaction_type == "mint_stable":
-                # Credit receiver
-                cursor.execute("""
-                    INSERT INTO balances (address, coin_type, balance)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (address, coin_type)
-                    DO UPDATE SET balance = balances.balance + %s, updated_at = CURRENT_TIMESTAMP
-                """, (tx.receiver, tx.coin_type, tx.amount, tx.amount))
-
-            elif tx.transaction_type == "mining_reward":
-                # Credit miner with reward + fees
-                cursor.execute("""
-                    INSERT INTO balances (address, coin_type, balance)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (address, coin_type)
-                    DO UPDATE SET balance = balances.balance + %s, updated_at = CURRENT_TIMESTAMP
-                """, (tx.receiver, tx.coin_type, tx.amount, tx.amount))
-
+            amount = tx.amount
+            if tx.transaction_type in CREDIT_ONLY_TYPES:
+                # Credit receiver (miner reward already includes fees)
+                deltas[(tx.receiver, tx.coin_type)] += amount
             else:  # Regular transfer with fees
-                # Debit sender (amount + fee)
-                total_debit = tx.amount + tx.fee
-                cursor.execute("""
-                    INSERT INTO balances (address, coin_type, balance)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (address, coin_type)
-                    DO UPDATE SET balance = balances.balance - %s, updated_at = CURRENT_TIMESTAMP
-                """, (tx.sender, tx.coin_type, 0, total_debit))
-
-                # Credit receiver (only amount, fees go to miner)
-                cursor.execute("""
-                    INSERT INTO balances (address, coin_type, balance)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (address, coin_type)
-                    DO UPDATE SET balance = balances.balance + %s, updated_at = CURRENT_TIMESTAMP
-                """, (tx.receiver, tx.coin_type, tx.amount, tx.amount))
+                # Debit sender (amount + fee), credit receiver (only amount, fees go to miner)
+                deltas[(tx.sender, tx.coin_type)] -= amount + tx.fee
+                deltas[(tx.receiver, tx.coin_type)] += amount
+
+        # Addresses whose changes cancel out are not written at all.
+        # Sorted rows lock balances in a fixed order across concurrent block commits.
+        rows = [(address, coin_type, delta)
+                for (address, coin_type), delta in sorted(deltas.items()) if delta]
+        if not rows:
+            return
+        execute_values(cursor, """
+            INSERT INTO balances (address, coin_type, balance)
+            VALUES %s
+            ON CONFLICT (address, coin_type)
+            DO UPDATE SET balance = balances.balance + EXCLUDED.balance, updated_at = CURRENT_TIMESTAMP
+        """, rows, page_size=500)
 
     def get_latest_block(self):
         """Get latest block with caching"""
@@ -444,85 +527,104 @@ class UltraRobustBlockchain:
                     return block_dict
         return None
 
-    def get_balance(self, address: str, coin_type: str = "CAD-COIN") -> float:
+    def get_balance(self, address: str, coin_type: str = "CAD-COIN") -> Decimal:
         """Get balance with enhanced caching"""
-        cache_key = f"balance_{address}_{coin_type}"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            return float(cached)
-
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
+        return self.get_balances_bulk([(address, coin_type)])[(address, coin_type)]
+
+    def get_balances_bulk(self, pairs) -> Dict[Tuple[str, str], Decimal]:
+        """Balances for many (address, coin_type) pairs: one cache MGET, one query for the misses.
+
+        Balances stay exact Decimals (cached as their decimal strings); callers
+        convert to float only when rendering JSON.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return {}
+
+        cached = self.cache.mget([f"balance_{address}_{coin_type}" for address, coin_type in pairs])
+        balances = {pair: Decimal(str(value)) for pair, value in zip(pairs, cached) if value is not None}
+        missing = [pair for pair in pairs if pair not in balances]
+        if missing:
+            with self.db.get_tuple_cursor() as cur:
                 cur.execute("""
-                    SELECT balance FROM balances WHERE address = %s AND coin_type = %s
-                """, (address, coin_type))
-                result = cur.fetchone()
-                balance = float(result["balance"]) if result else 0.0
-                self.cache.set(cache_key, balance, 300)
-                return balance
+                    SELECT address, coin_type, balance FROM balances
+                    WHERE (address, coin_type) IN %s
+                """, (tuple(missing),))
+                found = {(address, coin_type): balance for address, coin_type, balance in cur.fetchall()}
+            fetched = {pair: found.get(pair, ZERO_BALANCE) for pair in missing}
+            self.cache.mset({f"balance_{address}_{coin_type}": balance
+                             for (address, coin_type), balance in fetched.items()}, 300)
+            balances.update(fetched)
+        return balances
 
     def get_enhanced_chain_info(self):
         """Get comprehensive chain information"""
+        return loads(self.get_enhanced_chain_info_json())
+
+    def get_enhanced_chain_info_json(self) -> bytes:
+        """Get chain information as JSON bytes, served verbatim from the cache when warm"""
         cache_key = "enhanced_chain_info"
-        cached = self.cache.get(cache_key)
+        cached = self.cache.get_raw(cache_key)
         if cached:
             return cached
 
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
-                # Basic chain info
-                cur.execute("SELECT COUNT(*) AS chain_length FROM blocks")
-                chain_length = int(cur.fetchone()["chain_length"])
-
-                cur.execute("SELECT COUNT(*) AS pending_count FROM pending_transactions")
-                pending_count = int(cur.fetchone()["pending_count"])
-
-                # Latest block info
-                latest_block = self.get_latest_block()
-                current_difficulty = self.calculate_current_difficulty()
-                current_reward = self.calculate_mining_reward(latest_block["index"] + 1 if latest_block else 0)
-
-                # Recent mining statistics
-                cur.execute("""
-                    SELECT AVG(mining_time) as avg_mining_time, AVG(hash_rate) as avg_hash_rate
-                    FROM chain_stats 
-                    WHERE block_index >= %s
-                """, (max(0, chain_length - 10),))
-                stats = cur.fetchone()
-
-                # Network hash rate estimation
-                cur.execute("""
-                    SELECT AVG(POWER(2, difficulty) / mining_time) as estimated_hash_rate
-                    FROM blocks 
-                    WHERE index > 0 AND mining_time > 0
-                    ORDER BY index DESC 
-                    LIMIT 10
-                """)
-                hash_rate_result = cur.fetchone()
-
-                info = {
-                    "chain_length": chain_length,
-                    "current_difficulty": current_difficulty,
-                    "base_difficulty": self.base_difficulty,
-                    "max_difficulty": self.max_difficulty,
-                    "pending_transactions": pending_count,
-                    "max_pending_transactions": self.max_pending_transactions,
-                    "current_mining_reward": current_reward,
-                    "base_mining_reward": self.base_mining_reward,
-                    "target_block_time": self.target_block_time,
-                    "avg_mining_time": float(stats["avg_mining_time"]) if stats["avg_mining_time"] else 0,
-                    "estimated_network_hash_rate": float(hash_rate_result["estimated_hash_rate"]) if hash_rate_result and hash_rate_result["estimated_hash_rate"] else 0,
-                    "min_transaction_fee": self.min_transaction_fee,
-                    "max_block_size": self.max_block_size,
-                    "halving_interval": self.halving_interval,
-                    "difficulty_adjustment_interval": self.difficulty_adjustment_interval,
-                    "stable_coins": self.get_stable_coins(),
-                    "latest_block_hash": latest_block["hash"] if latest_block else None,
-                    "chain_integrity_status": "validated"
-                }
-                
-                self.cache.set(cache_key, info, 60)
-                return info
+        info = self._compute_enhanced_chain_info()
+        raw = dumps(info)
+        self.cache.set_raw(cache_key, raw, self.target_block_time)
+        return raw
+
+    def _compute_enhanced_chain_info(self):
+        # Counters and recent mining statistics in one round trip
+        with self.db.get_tuple_cursor() as cur:
+            cur.execute("""
+                WITH counters AS (
+                    SELECT MAX(value) FILTER (WHERE name = 'blocks') AS blocks,
+                           MAX(value) FILTER (WHERE name = 'pending') AS pending
+                    FROM meta_counters
+                ), stats AS (
+                    SELECT AVG(avg_block_time) AS avg_mining_time
+                    FROM chain_stats
+                    WHERE block_index >= (SELECT blocks - 10 FROM counters)
+                ), hrate AS (
+                    SELECT AVG(POWER(2, difficulty) / mining_time) AS estimated_hash_rate
+                    FROM (
+                        SELECT difficulty, mining_time FROM blocks
+                        WHERE index > 0 AND mining_time > 0
+                        ORDER BY index DESC
+                        LIMIT 10
+                    ) recent
+                )
+                SELECT counters.blocks, counters.pending, stats.avg_mining_time, hrate.estimated_hash_rate
+                FROM counters, stats, hrate
+            """)
+            chain_length, pending_count, avg_mining_time, estimated_hash_rate = cur.fetchone()
+
+        # Latest block info
+        tip = self._get_tip()
+        current_difficulty = self.calculate_current_difficulty(tip)
+        current_reward = self.calculate_mining_reward(tip["index"] + 1 if tip else 0)
+
+        info = {
+            "chain_length": chain_length,
+            "current_difficulty": current_difficulty,
+            "base_difficulty": self.base_difficulty,
+            "max_difficulty": self.max_difficulty,
+            "pending_transactions": pending_count,
+            "max_pending_transactions": self.max_pending_transactions,
+            "current_mining_reward": current_reward,
+            "base_mining_reward": self.base_mining_reward,
+            "target_block_time": self.target_block_time,
+            "avg_mining_time": float(avg_mining_time) if avg_mining_time else 0,
+            "estimated_network_hash_rate": float(estimated_hash_rate) if estimated_hash_rate else 0,
+            "min_transaction_fee": self.min_transaction_fee,
+            "max_block_size": self.max_block_size,
+            "halving_interval": self.halving_interval,
+            "difficulty_adjustment_interval": self.difficulty_adjustment_interval,
+            "stable_coins": self.get_stable_coins(),
+            "latest_block_hash": tip["hash"] if tip else None,
+            "chain_integrity_status": "validated"
+        }
+        return info
 
     # Existing methods with minimal changes for compatibility
     def get_pending_transactions(self):
@@ -530,13 +632,22 @@ class UltraRobustBlockchain:
         return self.get_priority_pending_transactions()
 
     def get_all_balances(self, address: str) -> Dict[str, float]:
-        """Get all balances for an address"""
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
+        """Get all balances for an address, cached as one value per address"""
+        cache_key = f"balances_{address}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # Empty dict is a valid cached answer: the address has no balance rows
+            balances = {coin: Decimal(str(balance)) for coin, balance in cached.items()}
+        else:
+            with self.db.get_tuple_cursor() as cur:
                 cur.execute("""
                     SELECT coin_type, balance FROM balances WHERE address = %s
                 """, (address,))
-                return {row["coin_type"]: float(row["balance"]) for row in cur.fetchall()}
+                balances = dict(cur.fetchall())
+            self.cache.set(cache_key, balances, 300)
+
+        # JSON boundary: the API reports balances as numbers
+        return {coin: float(balance) for coin, balance in balances.items()}
 
     def get_stable_coins(self):
         """Get all stablecoins"""
@@ -563,25 +674,24 @@ class UltraRobustBlockchain:
                     ORDER BY b.index DESC
                     LIMIT %s OFFSET %s
                 """, (limit, offset))
-                blocks = [dict(b) for b in cur.fetchall()]
-                if not blocks:
-                    return []
+                by_index = {b["index"]: {**b, "transactions": []} for b in cur.fetchall()}
+            if not by_index:
+                return []
+
+            # Gather block indexes
+            idxs = list(by_index)
 
-                # Gather block indexes
-                idxs = [b["index"] for b in blocks]
+            # Transactions can run to many rows per block: stream them through a
+            # server-side cursor straight into their block instead of materializing them
+            with conn.cursor(name="block_txs_stream") as cur:
+                cur.itersize = 1000
                 cur.execute("""
                     SELECT * FROM transactions
                     WHERE block_index = ANY(%s)
                     ORDER BY created_at ASC
                 """, (idxs,))
-                txs = [dict(t) for t in cur.fetchall()]
 
-                # Group transactions by block
-                by_index = {}
-                for b in blocks:
-                    by_index[b["index"]] = {**b, "transactions": []}
-                    
-                for t in txs:
+                for t in cur:
                     by_index[t["block_index"]]["transactions"].append({
                         "id": t["tx_id"],
                         "sender": t["sender"],
@@ -594,14 +704,52 @@ class UltraRobustBlockchain:
                         "timestamp": t["timestamp"],
                         "validation_status": t["validation_status"]
                     })
-                    
-                return [by_index[i] for i in idxs]
+
+            return [by_index[i] for i in idxs]
+
+    def get_blocks_keyset(self, after_index: Optional[int] = None, limit: int = 20):
+        """Stream blocks older than after_index (newest first) with their transactions.
+
+        Keyset pagination over the blocks primary key through a server-side
+        cursor, so cost is independent of page depth and rows are yielded as
+        they arrive instead of being materialized.
+        """
+        upper_bound = after_index if after_index is not None else 2 ** 31 - 1
+        with self.db.get_connection() as conn:
+            with conn.cursor(name="chain_stream") as cur:
+                cur.itersize = 100
+                cur.execute("""
+                    SELECT b.*, cs.hash_rate, cs.avg_block_time,
+                           COALESCE((
+                               SELECT json_agg(json_build_object(
+                                   'id', t.tx_id,
+                                   'sender', t.sender,
+                                   'receiver', t.receiver,
+                                   'amount', t.amount,
+                                   'fee', t.fee,
+                                   'coin_type', t.coin_type,
+                                   'transaction_type', t.transaction_type,
+                                   'metadata', t.metadata,
+                                   'timestamp', t.timestamp,
+                                   'validation_status', t.validation_status
+                               ) ORDER BY t.created_at)
+                               FROM transactions t
+                               WHERE t.block_index = b.index
+                           ), '[]'::json) AS transactions
+                    FROM blocks b
+                    LEFT JOIN chain_stats cs ON b.index = cs.block_index
+                    WHERE b.index < %s
+                    ORDER BY b.index DESC
+                    LIMIT %s
+                """, (upper_bound, limit))
+                for row in cur:
+                    yield dict(row)
 
     # Existing methods for compatibility (simplified versions)
     def create_stable_coin(self, name: str, symbol: str, collateral_ratio: float,
                            backed_by: str, max_supply: float = None):
         """Create a new stablecoin (existing functionality)"""
-        symbol = symbol.upper()
+        symbol = CoinSymbol(symbol)
         try:
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
@@ -611,7 +759,7 @@ class UltraRobustBlockchain:
                     """, (symbol, name, collateral_ratio, backed_by, max_supply, time.time()))
                     conn.commit()
 
-                    self.cache.delete("stable_coins")
+                    self.cache.delete("stable_coins", "stable_coins_response")
                     logger.info(f"StableCoin {name} ({symbol}) created")
                     return True, f"StableCoin {name} ({symbol}) created"
         except psycopg2.IntegrityError:
@@ -620,27 +768,53 @@ class UltraRobustBlockchain:
             logger.error(f"Create stablecoin error: {e}")
             return False, "Error creating stablecoin"
 
+    def _note_stable_coin_supply(self, symbol: str, max_supply, total_supply):
+        """Record an observed total supply, keeping the highest one seen"""
+        with self._stable_coin_lock:
+            cached = self._stable_coin_supplies.get(symbol)
+            if cached is None or total_supply > cached[1]:
+                cached = self._stable_coin_supplies[symbol] = (max_supply, total_supply)
+            return cached
+
+    def _get_stable_coin_supply(self, symbol: str):
+        """(max_supply, total_supply) of a stablecoin, or None if it does not exist"""
+        supply = self._stable_coin_supplies.get(symbol)
+        if supply is None:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cur:
+                    self.db.execute_prepared(cur, "stable_coin_supply", (symbol,))
+                    row = cur.fetchone()
+            if row is None:
+                return None
+            supply = self._note_stable_coin_supply(symbol, row["max_supply"], row["total_supply"])
+        return supply
+
+    @staticmethod
+    def _exceeds_cached_cap(supply, amount: Decimal) -> bool:
+        """True if minting amount is over the cap even at the cached (lowest possible) supply"""
+        max_supply, total_supply = supply
+        return max_supply is not None and total_supply + amount > max_supply
+
     def add_authorized_minter(self, coin_symbol: str, minter_address: str, authorizer: str):
         """Authorize a minter for a stablecoin (existing functionality)"""
-        coin_symbol = coin_symbol.upper()
+        coin_symbol = CoinSymbol(coin_symbol)
         try:
+            # Both lookups are cached, and run before borrowing a pooled connection
+            if self._get_stable_coin_supply(coin_symbol) is None:
+                return False, "StableCoin does not exist"
+            if authorizer != "system" and self.get_balance(authorizer, "CAD-COIN") < 100:
+                return False, "Insufficient authorization"
+
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute("SELECT symbol FROM stable_coins WHERE symbol = %s", (coin_symbol,))
-                    if not cur.fetchone():
-                        return False, "StableCoin does not exist"
-
-                    if authorizer != "system":
-                        balance = self.get_balance(authorizer, "CAD-COIN")
-                        if balance < 100:
-                            return False, "Insufficient authorization"
-
-                    cur.execute("""
-                        INSERT INTO authorized_minters (coin_symbol, minter_address, authorizer)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (coin_symbol, minter_address) DO NOTHING
-                    """, (coin_symbol, minter_address, authorizer))
+                    self.db.execute_prepared(cur, "authorize_minter", (coin_symbol, minter_address, authorizer))
+                    if cur.fetchone() is None:
+                        # The conflicting grant is already committed, so it is safe to remember
+                        self._authorized_minters.add((coin_symbol, minter_address))
+                        return True, f"Minter {minter_address} already authorized for {coin_symbol}"
                     conn.commit()
+                    # Only remembered once durable: the mint paths trust this set without a query
+                    self._authorized_minters.add((coin_symbol, minter_address))
 
                     logger.info(f"Minter {minter_address} authorized for {coin_symbol}")
                     return True, f"Minter {minter_address} authorized for {coin_symbol}"
@@ -650,68 +824,149 @@ class UltraRobustBlockchain:
 
     def is_authorized_minter(self, coin_symbol: str, minter: str):
         """Check if address is an authorized minter for the coin"""
-        if minter == "system":
-            return True
-
         with self.db.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT COUNT(*) AS c FROM authorized_minters
-                    WHERE coin_symbol = %s AND minter_address = %s
-                """, (coin_symbol, minter))
-                return int(cur.fetchone()["c"]) > 0
+                return self._is_authorized_minter(cur, coin_symbol, minter)
+
+    def _is_authorized_minter(self, cur, coin_symbol: str, minter: str) -> bool:
+        """Authorization check on the caller's cursor, so it runs on the caller's connection"""
+        if minter == "system" or (coin_symbol, minter) in self._authorized_minters:
+            return True
 
-    def mint_stable_coin(self, coin_symbol: str, minter: str, recipient: str, amount: float):
+        self.db.execute_prepared(cur, "check_minter", (coin_symbol, minter))
+        if cur.fetchone() is None:
+            return False
+        self._authorized_minters.add((coin_symbol, minter))
+        return True
+
+    def mint_stable_coin(self, coin_symbol: str, minter: str, recipient: str, amount):
         """Mint stablecoins (existing functionality with enhancements)"""
-        coin_symbol = coin_symbol.upper()
-        amount = float(amount)
+        coin_symbol = CoinSymbol(coin_symbol)
+        try:
+            amount = to_amount(amount)
+        except ValueError:
+            return False, "Invalid amount"
         if amount <= 0:
             return False, "Amount must be positive"
         try:
+            # Calculate minting fee
+            minting_fee = self._default_fee(amount)
+
+            mint_tx = Transaction(
+                sender="mint",
+                receiver=recipient,
+                amount=amount,
+                coin_type=coin_symbol,
+                transaction_type="mint_stable",
+                metadata={"minter": minter, "stable_coin": coin_symbol},
+                fee=minting_fee
+            )
+            # Everything checkable locally is rejected before a pooled connection is taken
+            is_valid, error = mint_tx.is_valid()
+            if not is_valid:
+                return False, error
+
+            supply = self._get_stable_coin_supply(coin_symbol)
+            if supply is None:
+                return False, "StableCoin does not exist"
+            if self._exceeds_cached_cap(supply, amount):
+                return False, "Exceeds max supply"
+
             with self.db.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute("SELECT * FROM stable_coins WHERE symbol = %s", (coin_symbol,))
-                    stable_coin = cur.fetchone()
-                    if not stable_coin:
+                    self.db.execute_prepared(cur, "mint_stable", (
+                        minter, coin_symbol, mint_tx.amount, mint_tx.id, mint_tx.sender, mint_tx.receiver,
+                        mint_tx.fee, mint_tx.transaction_type, dumps_text(mint_tx.metadata), mint_tx.timestamp,
+                        priority_score(mint_tx.fee, mint_tx.timestamp)
+                    ))
+                    outcome = cur.fetchone()
+                    if not outcome["coin_exists"]:
                         return False, "StableCoin does not exist"
-
-                    if not self.is_authorized_minter(coin_symbol, minter):
+                    if not outcome["authorized"]:
                         return False, "Minter not authorized"
+                    if not outcome["minted"]:
+                        return False, "Exceeds max supply"
 
-                    if stable_coin["max_supply"] is not None:
-                        curr_supply = float(stable_coin["total_supply"])
-                        max_supply = float(stable_coin["max_supply"])
-                        if curr_supply + amount > max_supply:
-                            return False, "Exceeds max supply"
-
-                    # Calculate minting fee
-                    minting_fee = max(self.min_transaction_fee, amount * 0.001)
-                    
-                    mint_tx = Transaction(
-                        sender="mint",
-                        receiver=recipient,
-                        amount=amount,
-                        coin_type=coin_symbol,
-                        transaction_type="mint_stable",
-                        metadata={"minter": minter, "stable_coin": coin_symbol},
-                        fee=minting_fee
-                    )
-                    
-                    cur.execute("""
-                        INSERT INTO pending_transactions 
-                        (tx_id, sender, receiver, amount, fee, coin_type, transaction_type, metadata, timestamp, priority_score)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (mint_tx.id, mint_tx.sender, mint_tx.receiver, mint_tx.amount, mint_tx.fee,
-                          mint_tx.coin_type, mint_tx.transaction_type, json.dumps(mint_tx.metadata), 
-                          mint_tx.timestamp, int(minting_fee * 1000)))
-
-                    cur.execute("""
-                        UPDATE stable_coins SET total_supply = COALESCE(total_supply, 0) + %s WHERE symbol = %s
-                    """, (amount, coin_symbol))
-
-                    conn.commit()
+                    self.db.commit(conn, durable=not self.async_mempool_commit)
+                    self._note_stable_coin_supply(coin_symbol, supply[0], outcome["total_supply"])
+                    self.cache.delete("stable_coins", "stable_coins_response")
                     logger.info(f"{amount} {coin_symbol} minted for {recipient} by {minter}")
                     return True, f"Mint queued: {amount} {coin_symbol} → {recipient} (fee: {minting_fee})"
         except Exception as e:
             logger.error(f"Mint error: {e}")
-            return False, "Mint error"
\ No newline at end of file
+            return False, "Mint error"
+
+    def mint_stable_coin_bulk(self, coin_symbol: str, minter: str, mints):
+        """Mint to many recipients at once; mints is a list of (recipient, amount).
+
+        All or nothing: the supply cap is checked against the summed amount in a
+        single UPDATE, and the pending mints go in with one multi-row INSERT.
+        """
+        coin_symbol = CoinSymbol(coin_symbol)
+        if not mints:
+            return False, "No mints given"
+
+        try:
+            mint_txs = []
+            for recipient, amount in mints:
+                try:
+                    amount = to_amount(amount)
+                except ValueError:
+                    return False, "Invalid amount"
+                if amount <= 0:
+                    return False, "Amount must be positive"
+                mint_tx = Transaction(
+                    sender="mint",
+                    receiver=recipient,
+                    amount=amount,
+                    coin_type=coin_symbol,
+                    transaction_type="mint_stable",
+                    metadata={"minter": minter, "stable_coin": coin_symbol},
+                    fee=self._default_fee(amount)
+                )
+                is_valid, error = mint_tx.is_valid()
+                if not is_valid:
+                    return False, error
+                mint_txs.append(mint_tx)
+            total = sum(tx.amount for tx in mint_txs)
+
+            supply = self._get_stable_coin_supply(coin_symbol)
+            if supply is None:
+                return False, "StableCoin does not exist"
+            if self._exceeds_cached_cap(supply, total):
+                return False, "Exceeds max supply"
+
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cur:
+                    if not self._is_authorized_minter(cur, coin_symbol, minter):
+                        return False, "Minter not authorized"
+
+                    cur.execute("""
+                        UPDATE stable_coins SET total_supply = COALESCE(total_supply, 0) + %(total)s
+                        WHERE symbol = %(coin)s
+                          AND (max_supply IS NULL OR COALESCE(total_supply, 0) + %(total)s <= max_supply)
+                        RETURNING total_supply
+                    """, {"total": total, "coin": coin_symbol})
+                    updated = cur.fetchone()
+                    if updated is None:
+                        return False, "Exceeds max supply"
+
+                    execute_values(cur, """
+                        INSERT INTO pending_transactions
+                        (tx_id, sender, receiver, amount, fee, coin_type, transaction_type, metadata,
+                         timestamp, priority_score)
+                        VALUES %s
+                    """, [
+                        (tx.id, tx.sender, tx.receiver, tx.amount, tx.fee, tx.coin_type, tx.transaction_type,
+                         dumps_text(tx.metadata), tx.timestamp, priority_score(tx.fee, tx.timestamp))
+                        for tx in mint_txs
+                    ], template="(%s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s)", page_size=500)
+
+                    self.db.commit(conn, durable=not self.async_mempool_commit)
+                    self._note_stable_coin_supply(coin_symbol, supply[0], updated["total_supply"])
+                    self.cache.delete("stable_coins", "stable_coins_response")
+                    logger.info(f"{total} {coin_symbol} minted to {len(mint_txs)} recipients by {minter}")
+                    return True, f"{len(mint_txs)} mints queued: {total} {coin_symbol}"
+        except Exception as e:
+            logger.error(f"Bulk mint error: {e}")
+            return False, "Mint error"
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Coin symbol type for CAD-COIN Blockchain
+"""
+
+
+class CoinSymbol(str):
+    """Canonical (upper-case) coin symbol.
+
+    Normalized once where a symbol enters the system; passing an existing
+    CoinSymbol back through CoinSymbol() returns it unchanged.
+    """
+    __slots__ = ()
+
+    def __new__(cls, symbol: str):
+        if type(symbol) is cls:
+            return symbol
+        return super().__new__(cls, symbol.upper())
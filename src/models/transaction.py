@@ -7,52 +7,113 @@ Transaction model for CAD-COIN Blockchain
 
 import time
 import uuid
-import json
 import hashlib
+from decimal import Decimal, InvalidOperation
 from typing import Tuple
 
+from ..utils import dumps_canonical
+
+AMOUNT_QUANTUM = Decimal("1E-8")  # Scale of the DECIMAL(20, 8) amount and fee columns
+AMOUNT_LIMIT = Decimal("1E12")    # Exclusive bound on magnitude for the same columns (12 integer digits)
+
+
+def to_amount(value) -> Decimal:
+    """Exact Decimal for an amount: Decimals pass through, floats and strings go via str().
+
+    str() of a float is its shortest round-trip form, so a JSON 0.1 becomes
+    Decimal("0.1") rather than the binary expansion of the float.
+    Raises ValueError for anything that is not a finite number or does not fit
+    the DECIMAL(20, 8) columns, so quantizing the result can never fail.
+    """
+    if not isinstance(value, Decimal):
+        try:
+            value = Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}") from None
+    if not value.is_finite() or abs(value) >= AMOUNT_LIMIT:
+        raise ValueError(f"Invalid amount: {value!r}")
+    return value
+
 
 class Transaction:
-    def __init__(self, sender: str, receiver: str, amount: float, coin_type: str = "CAD-COIN",
-                 transaction_type: str = "transfer", metadata: dict = None, fee: float = 0.0):
-        self.id = str(uuid.uuid4())
+    __slots__ = ("id", "sender", "receiver", "amount", "fee", "coin_type",
+                 "transaction_type", "metadata", "timestamp", "_dict", "_hash", "_valid")
+
+    def __init__(self, sender: str, receiver: str, amount, coin_type: str = "CAD-COIN",
+                 transaction_type: str = "transfer", metadata: dict = None, fee=0,
+                 tx_id: str = None, timestamp: float = None):
+        self.id = tx_id or uuid.uuid4().hex
         self.sender = sender
         self.receiver = receiver
-        self.amount = float(amount)
-        self.fee = float(fee)
+        # Exact, at the scale the database stores, so hashes match a row read back
+        self.amount = to_amount(amount).quantize(AMOUNT_QUANTUM)
+        self.fee = to_amount(fee).quantize(AMOUNT_QUANTUM)
         self.coin_type = coin_type
         self.transaction_type = transaction_type
         self.metadata = metadata or {}
-        self.timestamp = time.time()
+        self.timestamp = time.time() if timestamp is None else float(timestamp)
+        # Transactions are immutable once built: serialize, hash and validate at most once
+        self._dict = None
+        self._hash = None
+        self._valid = None
 
     def to_dict(self):
-        return {
-            "id": self.id,
-            "sender": self.sender,
-            "receiver": self.receiver,
-            "amount": self.amount,
-            "fee": self.fee,
-            "coin_type": self.coin_type,
-            "transaction_type": self.transaction_type,
-            "metadata": self.metadata,
-            "timestamp": self.timestamp
-        }
+        """Dict form of the transaction, built once and shared; callers must not mutate it"""
+        if self._dict is None:
+            self._dict = {
+                "id": self.id,
+                "sender": self.sender,
+                "receiver": self.receiver,
+                "amount": self.amount,
+                "fee": self.fee,
+                "coin_type": self.coin_type,
+                "transaction_type": self.transaction_type,
+                "metadata": self.metadata,
+                "timestamp": self.timestamp
+            }
+        return self._dict
+
+    def _hash_payload(self) -> bytes:
+        """Fixed field order, each field length-prefixed so no field can run into the next.
+
+        Only the free-form metadata needs canonical JSON; amounts use their fixed
+        8-place decimal form and the timestamp repr(), which round-trips exactly.
+        """
+        fields = (
+            self.id.encode(),
+            self.sender.encode(),
+            self.receiver.encode(),
+            str(self.amount).encode(),
+            str(self.fee).encode(),
+            self.coin_type.encode(),
+            self.transaction_type.encode(),
+            dumps_canonical(self.metadata),
+            repr(self.timestamp).encode(),
+        )
+        return b"".join(len(field).to_bytes(4, "big") + field for field in fields)
 
     def get_hash(self):
-        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+        if self._hash is None:
+            self._hash = hashlib.blake2b(self._hash_payload(), digest_size=32).hexdigest()
+        return self._hash
 
     def is_valid(self) -> Tuple[bool, str]:
         """Enhanced transaction validation"""
-        if self.amount <= 0:
-            return False, "Amount must be positive"
-        
-        if self.fee < 0:
+        if self._valid is None:
+            self._valid = self._validate()
+        return self._valid
+
+    def _validate(self) -> Tuple[bool, str]:
+        # Numeric checks first: one fused comparison on the common (valid) path
+        if self.amount <= 0 or self.fee < 0:
+            if self.amount <= 0:
+                return False, "Amount must be positive"
             return False, "Fee cannot be negative"
-        
+
         if len(self.sender) < 3 or len(self.receiver) < 3:
             return False, "Invalid address format"
-        
+
         if self.sender == self.receiver and self.transaction_type == "transfer":
             return False, "Cannot transfer to self"
-        
+
         return True, "Valid"
\ No newline at end of file
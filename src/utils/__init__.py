@@ -1,2 +1,4 @@
 # Utilities module
-# Reserved for future utility functions
\ No newline at end of file
+from .serialization import dumps, dumps_canonical, dumps_text, loads
+
+__all__ = ['dumps', 'dumps_canonical', 'dumps_text', 'loads']
\ No newline at end of file
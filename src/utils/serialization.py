@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Fast JSON serialization helpers for CAD-COIN Blockchain
+"""
+
+import orjson
+
+
+def dumps(value) -> bytes:
+    """Serialize to JSON bytes; unsupported types (e.g. Decimal) fall back to str.
+
+    Datetimes also go through str() ("2024-01-01 12:00:00"), the format cached
+    values had under json.dumps(default=str), rather than orjson's ISO-8601.
+    """
+    return orjson.dumps(value, default=str,
+                        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def dumps_canonical(value) -> bytes:
+    """Compact JSON with sorted keys: a stable byte representation for hashing"""
+    return orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS)
+
+
+def dumps_text(value) -> str:
+    """Serialize to a JSON str, for text parameters such as JSONB columns"""
+    return dumps(value).decode("utf-8")
+
+
+def loads(value):
+    """Deserialize JSON bytes or str"""
+    return orjson.loads(value)
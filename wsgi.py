@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CAD-COIN Blockchain — production WSGI entry point
+
+Run with:  gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+# Make psycopg2 cooperative under gevent before any connection is opened
+from psycogreen.gevent import patch_psycopg
+
+patch_psycopg()
+
+from main import create_app  # noqa: E402
+
+# gunicorn.conf.py applies the schema once in the master before workers fork
+app = create_app(init_schema=False)